@@ -1,19 +1,142 @@
 import dearpygui.dearpygui as dpg
+import collections
+import queue
+import re
 import threading
 import time
-from typing import Optional, Callable
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
 from safe_print import safe_print
 import os
 from minimize_to_tray import TrayManager
 
+_get_value = dpg.get_value
+_set_value = dpg.set_value
+
+LOG_FLUSH_INTERVAL = 0.05
+MAX_LOG_ENTRIES = 2000
+LOG_FLUSH_BATCH = 64
+SETTING_DEBOUNCE = 0.05
+AUDIO_TIME_RESOLUTION = 10
+IDLE_FRAME_SLEEP = 0.016
+INPUT_ACTIVE_WINDOW = 0.25
+ERROR_TEXT_COLOR = (255, 50, 50)
+TITLE_WRAP = 450
+ICON_PATH = os.path.join(os.path.dirname(__file__), "src", "logo.png")
+ICON_EXISTS = os.path.isfile(ICON_PATH)
+
+MINIMAL_CRITICAL_KEYWORDS = (
+	"ERROR", "FATAL", "WARNING", "STOPPED", "STARTED",
+	"Bot ENABLED", "Bot DISABLED", "Prepared beatmap",
+	"Game state changed", "Humanize:", "Bot Status:",
+	"Player died", "Map fixed", "Detected PAUSE", "Detected UNPAUSE",
+	"Detected RESTART", "Bot execution completed"
+)
+MINIMAL_VERBOSE_KEYWORDS = (
+	"[TIMING]", "[PAUSE]", "Stopping bot", "Δ:", "Audio timer",
+	"Will resume from", "Resetting for restart", "audio:",
+	"Timing shift:", "Offset:", "Waiting for audio"
+)
+MINIMAL_CRITICAL_RE = re.compile("|".join(map(re.escape, MINIMAL_CRITICAL_KEYWORDS)))
+MINIMAL_VERBOSE_RE = re.compile("|".join(map(re.escape, MINIMAL_VERBOSE_KEYWORDS)))
+
+THEME_COLORS = (
+	(dpg.mvThemeCol_WindowBg, (16, 16, 16, 255)),
+	(dpg.mvThemeCol_Text, (255, 255, 255, 255)),
+	(dpg.mvThemeCol_Button, (50, 50, 50, 255)),
+	(dpg.mvThemeCol_ButtonHovered, (70, 70, 70, 255)),
+	(dpg.mvThemeCol_ButtonActive, (90, 90, 90, 255)),
+	(dpg.mvThemeCol_FrameBg, (30, 30, 30, 255)),
+	(dpg.mvThemeCol_ChildBg, (20, 20, 20, 255)),
+	(dpg.mvThemeCol_ScrollbarBg, (10, 10, 10, 255)),
+	(dpg.mvThemeCol_ScrollbarGrab, (60, 60, 60, 255)),
+	(dpg.mvThemeCol_Header, (40, 40, 40, 255)),
+	(dpg.mvThemeCol_HeaderHovered, (50, 50, 50, 255)),
+	(dpg.mvThemeCol_HeaderActive, (60, 60, 60, 255)),
+)
+
+GAME_STATE_PREFIX = "Game State: "
+OSU_STATUS_PREFIX = "osu! Status: "
+TITLE_PREFIX = "Title: "
+DIFFICULTY_PREFIX = "Difficulty: "
+MAPPER_PREFIX = "Mapper: "
+MODE_PREFIX = "Mode: "
+KEYS_PREFIX = "Keys: "
+MAP_ID_PREFIX = "Map ID: "
+MODS_PREFIX = "Mods: "
+SPEED_PREFIX = "Speed: "
+AUDIO_TIME_PREFIX = "Audio Time: "
+SCORE_PREFIX = "Score: "
+COMBO_PREFIX = "Combo: "
+ACCURACY_PREFIX = "Accuracy: "
+HP_PREFIX = "HP: "
+HITS_PREFIX = "Hits: "
+BOT_STATUS_PREFIX = "Bot Status: "
+FIRST_NOTE_PREFIX = "First Note: "
+TWO_DIGITS = tuple(f"{i:02d}" for i in range(100))
+THREE_DIGITS = tuple(f"{i:03d}" for i in range(1000))
+
+@dataclass(frozen=True)
+class BeatmapDisplay:
+	title: str
+	difficulty: str
+	mapper: str
+	mode: str
+	keys: int
+	map_id: int
+	cs_keys: Optional[int] = None
+	position_keys: Optional[int] = None
+	original_position_keys: Optional[int] = None
+	has_error: bool = False
+	error_message: str = ""
+	is_mania: bool = True
+
+
 class ManiaGUI:
 	
+	_CONNECTION_LABELS = (
+		("game_state_label", GAME_STATE_PREFIX, "Waiting..."),
+		("osu_status_label", OSU_STATUS_PREFIX, "Not Connected"),
+	)
+	_BEATMAP_LABELS = (
+		("beatmap_title", TITLE_PREFIX, "None"),
+		("beatmap_difficulty", DIFFICULTY_PREFIX, "None"),
+		("beatmap_mapper", MAPPER_PREFIX, "None"),
+		("beatmap_mode", MODE_PREFIX, "None"),
+		("beatmap_keys", KEYS_PREFIX, "None"),
+		("beatmap_id", MAP_ID_PREFIX, "None"),
+	)
+	_BEATMAP_ERROR_TAGS = ("map_error_message", "mode_not_supported")
+	_MODS_LABELS = (
+		("mods_label", MODS_PREFIX, "NM"),
+		("speed_label", SPEED_PREFIX, "1.00x"),
+		("audio_time_label", AUDIO_TIME_PREFIX, "00:00.000"),
+	)
+	_GAMEPLAY_LABELS = (
+		("gameplay_score", SCORE_PREFIX, "N/A"),
+		("gameplay_combo", COMBO_PREFIX, "N/A"),
+		("gameplay_accuracy", ACCURACY_PREFIX, "N/A"),
+		("gameplay_hp", HP_PREFIX, "N/A"),
+		("gameplay_hits", HITS_PREFIX, "N/A"),
+	)
+	_BOT_LABELS = (
+		("bot_status_label", BOT_STATUS_PREFIX, "Idle"),
+		("first_note_label", FIRST_NOTE_PREFIX, "N/A"),
+	)
+	_STATUS_SECTIONS = (_CONNECTION_LABELS, _BEATMAP_LABELS, _MODS_LABELS, _GAMEPLAY_LABELS, _BOT_LABELS)
+	_LABEL_WRAP = {"beatmap_title": TITLE_WRAP}
+	_icon_image: Optional[tuple] = None
+	
 	def __init__(self, width: int = 1000, height: int = 600):
 		self.width = width
 		self.height = height
 		self.viewport = None
-		self.log_entry_count = 0
 		self.log_mode = "Normal"
+		self._log_queue = collections.deque(maxlen=MAX_LOG_ENTRIES)
+		self._log_ids = collections.deque()
+		self._last_log_flush = 0.0
+		self._last_log_text: Optional[str] = None
+		self._last_log_repeat = 0
 
 		self.on_start_bot: Optional[Callable] = None
 		self.on_stop_bot: Optional[Callable] = None
@@ -23,8 +146,26 @@ class ManiaGUI:
 		self.on_osu_unlock_scan: Optional[Callable] = None
 		self.on_osu_unlock_unlock: Optional[Callable] = None
 
-		self.title_bar_drag = False
 		self._running = False
+		self._built = False
+		self._rendering = False
+		self._destroyed = False
+		self._dirty = True
+		self._visible = threading.Event()
+		self._visible.set()
+		self._last_values: Dict[str, str] = {}
+		self._last_audio_bucket: Optional[int] = None
+		self._last_beatmap: Optional[BeatmapDisplay] = None
+		self._last_mods: Optional[tuple] = None
+		self._last_gameplay: Optional[tuple] = None
+		self._unlock_button_shown = False
+		self._print_queue: queue.SimpleQueue = queue.SimpleQueue()
+		self._print_thread: Optional[threading.Thread] = None
+		self._pending_offset: Optional[int] = None
+		self._pending_offset_deadline = 0.0
+		self._pending_timing_shift: Optional[int] = None
+		self._pending_timing_shift_deadline = 0.0
+		self._bot_status_text: Optional[str] = None
 		self.tray_manager = TrayManager(
 			on_restore_callback=self._on_tray_restore,
 			on_exit_callback=self._on_tray_exit
@@ -41,7 +182,15 @@ class ManiaGUI:
 			pass
 
 	def _initialize_once(self) -> None:
+		self._built = False
+		self._last_values.clear()
+		self._last_audio_bucket = None
+		self._last_beatmap = None
+		self._last_mods = None
+		self._last_gameplay = None
+		self._unlock_button_shown = False
 		dpg.create_context()
+		self._destroyed = False
 		self.viewport = dpg.create_viewport(
 			title="PrismaTC",
 			width=self.width,
@@ -57,11 +206,23 @@ class ManiaGUI:
 		self._load_icon_texture()
 		self._build_gui()
 
-		self.drag_offset_x = 0
-		self.drag_offset_y = 0
 		self.is_dragging = False
+		self._last_vp_pos = None
+		self._drag_offset = (0.0, 0.0)
+		self._last_input = 0.0
+		with dpg.handler_registry():
+			dpg.add_mouse_click_handler(button=0, callback=self._drag_begin)
+			dpg.add_mouse_drag_handler(button=0, threshold=0.0, callback=self._drag_move)
+			dpg.add_mouse_release_handler(button=0, callback=self._drag_end)
+			dpg.add_mouse_move_handler(callback=self._mark_input)
+			dpg.add_mouse_click_handler(callback=self._mark_input)
+			dpg.add_mouse_wheel_handler(callback=self._mark_input)
+			dpg.add_key_down_handler(callback=self._mark_input)
 
 	def initialize(self, max_attempts: int = 3) -> None:
+		if self._print_thread is None:
+			self._print_thread = threading.Thread(target=self._print_worker, daemon=True)
+			self._print_thread.start()
 		last_error: Optional[Exception] = None
 		for attempt in range(1, max_attempts + 1):
 			try:
@@ -78,31 +239,27 @@ class ManiaGUI:
 			raise last_error
 	
 	def _load_icon_texture(self) -> None:
-		icon_path = os.path.join(os.path.dirname(__file__), "src", "logo.png")
-		if os.path.exists(icon_path):
-			width, height, channels, data = dpg.load_image(icon_path)
+		if ICON_EXISTS:
+			if ManiaGUI._icon_image is None:
+				ManiaGUI._icon_image = dpg.load_image(ICON_PATH)
+			width, height, channels, data = ManiaGUI._icon_image
 			with dpg.texture_registry():
 				dpg.add_static_texture(width=width, height=height, default_value=data, tag="icon_texture")
 	
 	def _apply_theme(self) -> None:
 		with dpg.theme() as global_theme:
 			with dpg.theme_component(dpg.mvAll):
-				dpg.add_theme_color(dpg.mvThemeCol_WindowBg, (16, 16, 16, 255))
-				dpg.add_theme_color(dpg.mvThemeCol_Text, (255, 255, 255, 255))
-				dpg.add_theme_color(dpg.mvThemeCol_Button, (50, 50, 50, 255))
-				dpg.add_theme_color(dpg.mvThemeCol_ButtonHovered, (70, 70, 70, 255))
-				dpg.add_theme_color(dpg.mvThemeCol_ButtonActive, (90, 90, 90, 255))
-				dpg.add_theme_color(dpg.mvThemeCol_FrameBg, (30, 30, 30, 255))
-				dpg.add_theme_color(dpg.mvThemeCol_ChildBg, (20, 20, 20, 255))
-				dpg.add_theme_color(dpg.mvThemeCol_ScrollbarBg, (10, 10, 10, 255))
-				dpg.add_theme_color(dpg.mvThemeCol_ScrollbarGrab, (60, 60, 60, 255))
-				dpg.add_theme_color(dpg.mvThemeCol_Header, (40, 40, 40, 255))
-				dpg.add_theme_color(dpg.mvThemeCol_HeaderHovered, (50, 50, 50, 255))
-				dpg.add_theme_color(dpg.mvThemeCol_HeaderActive, (60, 60, 60, 255))
+				for target, color in THEME_COLORS:
+					dpg.add_theme_color(target, color)
 		
 		dpg.bind_theme(global_theme)
 	
 	def _build_gui(self) -> None:
+		with dpg.value_registry():
+			for labels in self._STATUS_SECTIONS:
+				for tag, prefix, default in labels:
+					dpg.add_string_value(default_value=prefix + default, tag=tag)
+		
 		with dpg.window(
 			label="osu! Mania Bot",
 			width=self.width,
@@ -116,11 +273,12 @@ class ManiaGUI:
 			tag="primary"
 		):
 			with dpg.group(horizontal=True, tag="top_bar_group"):
-				if dpg.does_item_exist("icon_texture"):
+				has_icon = dpg.does_item_exist("icon_texture")
+				if has_icon:
 					dpg.add_image("icon_texture", width=20, height=20)
 					dpg.add_spacer(width=5)
 				dpg.add_text("PrismaTC", tag="title_text")
-				dpg.add_spacer(width=760 if dpg.does_item_exist("icon_texture") else 810)
+				dpg.add_spacer(width=760 if has_icon else 810)
 				dpg.add_button(label="_", width=50, callback=self._minimize_to_tray, tag="minimize_button")
 				dpg.add_button(label="X", width=50, callback=self._exit_program, tag="x_button")
 			
@@ -131,36 +289,23 @@ class ManiaGUI:
 					dpg.add_text("Status", tag="status_header")
 					dpg.add_separator()
 					
-					dpg.add_text("Game State: Waiting...", tag="game_state_label")
-					dpg.add_text("osu! Status: Not Connected", tag="osu_status_label")
+					self._add_labels(self._CONNECTION_LABELS)
 					dpg.add_separator()
 					
 					dpg.add_text("Current Beatmap", tag="beatmap_header")
-					dpg.add_text("Title: None", tag="beatmap_title", wrap=450)
-					dpg.add_text("Difficulty: None", tag="beatmap_difficulty")
-					dpg.add_text("Mapper: None", tag="beatmap_mapper")
-					dpg.add_text("Mode: None", tag="beatmap_mode")
-					dpg.add_text("Keys: None", tag="beatmap_keys")
-					dpg.add_text("Map ID: None", tag="beatmap_id")
-					dpg.add_text("", tag="map_error_message", color=(255, 50, 50))
-					dpg.add_text("", tag="mode_not_supported", color=(255, 50, 50))
+					self._add_labels(self._BEATMAP_LABELS)
+					for tag in self._BEATMAP_ERROR_TAGS:
+						dpg.add_text("", tag=tag, color=ERROR_TEXT_COLOR)
 					dpg.add_separator()
 					
-					dpg.add_text("Mods: NM", tag="mods_label")
-					dpg.add_text("Speed: 1.00x", tag="speed_label")
-					dpg.add_text("Audio Time: 00:00.000", tag="audio_time_label")
+					self._add_labels(self._MODS_LABELS)
 					dpg.add_separator()
 					
 					dpg.add_text("Gameplay Stats", tag="gameplay_header")
-					dpg.add_text("Score: N/A", tag="gameplay_score")
-					dpg.add_text("Combo: N/A", tag="gameplay_combo")
-					dpg.add_text("Accuracy: N/A", tag="gameplay_accuracy")
-					dpg.add_text("HP: N/A", tag="gameplay_hp")
-					dpg.add_text("Hits: N/A", tag="gameplay_hits")
+					self._add_labels(self._GAMEPLAY_LABELS)
 					dpg.add_separator()
 					
-					dpg.add_text("Bot Status: Idle", tag="bot_status_label")
-					dpg.add_text("First Note: N/A", tag="first_note_label")
+					self._add_labels(self._BOT_LABELS)
 					dpg.add_separator()
 					dpg.add_text("\n\n\n\n\n\nMade by Zerqqc")
     				
@@ -225,31 +370,11 @@ class ManiaGUI:
 								dpg.add_text("Bot initialized. Waiting for osu!...")
 		
 		dpg.set_primary_window("primary", True)
+		self._built = True
 	
-	def _on_titlebar_mouse_down(self, *args) -> None:
-		if not dpg.is_mouse_button_down(0):
-			return
-		_, y = dpg.get_mouse_pos()
-		self.title_bar_drag = (-2 <= y <= 25)
-	
-	def _on_titlebar_drag(self, *args) -> None:
-		if not self.title_bar_drag:
-			return
-		
-		data = args[-1] if args else None
-		if isinstance(data, (list, tuple)):
-			if len(data) >= 3:
-				dx, dy = data[1], data[2]
-			elif len(data) == 2:
-				dx, dy = data[0], data[1]
-			else:
-				return
-		else:
-			return
-		
-		pos = dpg.get_viewport_pos()
-		new_x, new_y = pos[0] + dx, pos[1] + dy
-		dpg.configure_viewport(self.viewport, x_pos=new_x, y_pos=new_y)
+	def _add_labels(self, labels: tuple) -> None:
+		for tag, _, _ in labels:
+			dpg.add_text(source=tag, tag=f"{tag}_text", wrap=self._LABEL_WRAP.get(tag, -1))
 	
 	def _start_bot_clicked(self, *args) -> None:
 		if self.on_start_bot:
@@ -262,14 +387,26 @@ class ManiaGUI:
 	def _offset_changed(self, *args) -> None:
 		if self.on_offset_change:
 			sender = args[0] if args else None
-			value = dpg.get_value(sender) if sender else 30
-			self.on_offset_change(value)
+			self._pending_offset = _get_value(sender) if sender else 30
+			self._pending_offset_deadline = time.monotonic() + SETTING_DEBOUNCE
 	
 	def _timing_shift_changed(self, *args) -> None:
 		if self.on_timing_shift_change:
 			sender = args[0] if args else None
-			value = dpg.get_value(sender) if sender else 0
-			self.on_timing_shift_change(value)
+			self._pending_timing_shift = _get_value(sender) if sender else 0
+			self._pending_timing_shift_deadline = time.monotonic() + SETTING_DEBOUNCE
+	
+	def _fire_pending_settings(self, now: float) -> None:
+		if self._pending_offset is not None and now >= self._pending_offset_deadline:
+			value = self._pending_offset
+			self._pending_offset = None
+			if self.on_offset_change:
+				self.on_offset_change(value)
+		if self._pending_timing_shift is not None and now >= self._pending_timing_shift_deadline:
+			value = self._pending_timing_shift
+			self._pending_timing_shift = None
+			if self.on_timing_shift_change:
+				self.on_timing_shift_change(value)
 	
 	def _osu_unlock_scan_clicked(self, *args) -> None:
 		if self.on_osu_unlock_scan:
@@ -282,17 +419,17 @@ class ManiaGUI:
 	def _toggle_log_mode(self, *args) -> None:
 		if self.log_mode == "Normal":
 			self.log_mode = "Minimal"
-			if dpg.does_item_exist("log_mode_button"):
-				dpg.set_item_label("log_mode_button", "Normal")
+			dpg.set_item_label("log_mode_button", "Normal")
 			self.log_message("Log mode: Minimal (reduced logs)", color=(100, 200, 255))
 		else:
 			self.log_mode = "Normal"
-			if dpg.does_item_exist("log_mode_button"):
-				dpg.set_item_label("log_mode_button", "Minimal")
+			dpg.set_item_label("log_mode_button", "Minimal")
 			self.log_message("Log mode: Normal (detailed logs)", color=(100, 200, 255))
 	
 	def _clear_logs(self, *args) -> None:
-		self.log_entry_count = 0
+		self._log_queue.clear()
+		self._log_ids.clear()
+		self._last_log_text = None
 		dpg.delete_item("log_content", children_only=True)
 		self.log_message("Logs cleared.")
 	
@@ -302,10 +439,11 @@ class ManiaGUI:
 		self.stop()
 	
 	def _minimize_to_tray(self, *args) -> None:
-		self.tray_manager.minimize_to_tray()
+		if self.tray_manager.minimize_to_tray():
+			self._visible.clear()
 	
 	def _on_tray_restore(self) -> None:
-		pass
+		self._visible.set()
 	
 	def _on_tray_exit(self) -> None:
 		if self.on_exit:
@@ -313,196 +451,217 @@ class ManiaGUI:
 		self.stop()
 	
 	def _should_show_in_minimal(self, message: str) -> bool:
-		critical_keywords = [
-			"ERROR", "FATAL", "WARNING", "STOPPED", "STARTED",
-			"Bot ENABLED", "Bot DISABLED", "Prepared beatmap",
-			"Game state changed", "Humanize:", "Bot Status:",
-			"Player died", "Map fixed", "Detected PAUSE", "Detected UNPAUSE",
-			"Detected RESTART", "Bot execution completed"
-		]
-		
-		for keyword in critical_keywords:
-			if keyword in message:
-				return True
-		verbose_keywords = [
-			"[TIMING]", "[PAUSE]", "Stopping bot", "Δ:", "Audio timer",
-			"Will resume from", "Resetting for restart", "audio:",
-			"Timing shift:", "Offset:", "Waiting for audio"
-		]
-		
-		for keyword in verbose_keywords:
-			if keyword in message:
-				return False
-		return True
+		if MINIMAL_CRITICAL_RE.search(message):
+			return True
+		return MINIMAL_VERBOSE_RE.search(message) is None
+	
+	def _print_worker(self) -> None:
+		while True:
+			message = self._print_queue.get()
+			if message is None:
+				return
+			safe_print(message)
 	
 	def log_message(self, message: str, color: tuple = (255, 255, 255)) -> None:
-		safe_print(message)
+		if self._print_thread is not None:
+			self._print_queue.put_nowait(message)
+		else:
+			safe_print(message)
 		if self.log_mode == "Minimal" and not self._should_show_in_minimal(message):
 			return
-		
-		if dpg.does_item_exist("log_content"):
-			self.log_entry_count += 1
-			text_id = dpg.add_text(message, parent="log_content", tag=f"log_entry_{self.log_entry_count}")
-			if color != (255, 255, 255):
-				dpg.configure_item(text_id, color=color)
-			if dpg.does_item_exist("log_content_window"):
-				dpg.set_y_scroll("log_content_window", -1.0)
+		self._log_queue.append((message, color))
+	
+	def _flush_logs(self) -> None:
+		if not self._built or not self._log_queue:
+			return
+		add_text = dpg.add_text
+		configure_item = dpg.configure_item
+		pending = self._log_queue
+		log_ids = self._log_ids
+		with dpg.mutex():
+			for _ in range(min(len(pending), LOG_FLUSH_BATCH)):
+				message, color = pending.popleft()
+				if message == self._last_log_text and log_ids:
+					self._last_log_repeat += 1
+					_set_value(log_ids[-1], f"{message} (x{self._last_log_repeat})")
+					continue
+				self._last_log_text = message
+				self._last_log_repeat = 1
+				if len(log_ids) >= MAX_LOG_ENTRIES:
+					# Recycle the oldest line instead of deleting it and creating a new one.
+					text_id = log_ids.popleft()
+					dpg.move_item(text_id, parent="log_content")
+					_set_value(text_id, message)
+					configure_item(text_id, color=color)
+				else:
+					text_id = add_text(message, parent="log_content")
+					if color != (255, 255, 255):
+						configure_item(text_id, color=color)
+				log_ids.append(text_id)
+			dpg.set_y_scroll("log_content_window", -1.0)
+		self._dirty = True
+	
+	def _set(self, tag: str, value: str) -> None:
+		if self._last_values.get(tag) != value:
+			_set_value(tag, value)
+			self._last_values[tag] = value
+			self._dirty = True
 	
 	def update_game_state(self, state_name: str) -> None:
-		if dpg.does_item_exist("game_state_label"):
-			dpg.set_value("game_state_label", f"Game State: {state_name}")
+		if not self._built:
+			return
+		self._set("game_state_label", GAME_STATE_PREFIX + state_name)
 	
 	def update_osu_status(self, connected: bool, pid: Optional[int] = None) -> None:
-		if dpg.does_item_exist("osu_status_label"):
-			if connected and pid:
-				dpg.set_value("osu_status_label", f"osu! Status: Connected (PID {pid})")
-			elif connected:
-				dpg.set_value("osu_status_label", "osu! Status: Connected")
-			else:
-				dpg.set_value("osu_status_label", "osu! Status: Not Connected")
-	
-	def update_beatmap_info(self, title: str, difficulty: str, mapper: str, 
-	                        mode: str, keys: int, map_id: int, cs_keys: int = None, 
-	                        position_keys: int = None, original_position_keys: int = None, has_error: bool = False, 
-	                        error_message: str = "", is_mania: bool = True) -> None:
-		if dpg.does_item_exist("beatmap_title"):
-			dpg.set_value("beatmap_title", f"Title: {title}")
-		if dpg.does_item_exist("beatmap_difficulty"):
-			dpg.set_value("beatmap_difficulty", f"Difficulty: {difficulty}")
-		if dpg.does_item_exist("beatmap_mapper"):
-			dpg.set_value("beatmap_mapper", f"Mapper: {mapper}")
-		
-		if dpg.does_item_exist("beatmap_mode"):
-			if is_mania and cs_keys is not None:
-				dpg.set_value("beatmap_mode", f"Mode: Mania {cs_keys}K (CS-based)")
+		if not self._built:
+			return
+		if connected and pid:
+			self._set("osu_status_label", f"{OSU_STATUS_PREFIX}Connected (PID {pid})")
+		elif connected:
+			self._set("osu_status_label", OSU_STATUS_PREFIX + "Connected")
+		else:
+			self._set("osu_status_label", OSU_STATUS_PREFIX + "Not Connected")
+	
+	def update_beatmap_info(self, info: BeatmapDisplay) -> None:
+		if not self._built or info == self._last_beatmap:
+			return
+		self._last_beatmap = info
+		with dpg.mutex():
+			self._set("beatmap_title", TITLE_PREFIX + info.title)
+			self._set("beatmap_difficulty", f"{DIFFICULTY_PREFIX}{info.difficulty}")
+			self._set("beatmap_mapper", f"{MAPPER_PREFIX}{info.mapper}")
+			
+			if info.is_mania and info.cs_keys is not None:
+				self._set("beatmap_mode", f"{MODE_PREFIX}Mania {info.cs_keys}K (CS-based)")
 			else:
-				dpg.set_value("beatmap_mode", f"Mode: {mode}")
-		
-		if dpg.does_item_exist("beatmap_keys"):
-			if is_mania and position_keys is not None:
-				if original_position_keys is not None and original_position_keys > cs_keys:
-					dpg.set_value("beatmap_keys", f"Keys: {position_keys}K (fixed from {original_position_keys} positions)")
+				self._set("beatmap_mode", MODE_PREFIX + info.mode)
+			
+			if info.is_mania and info.position_keys is not None:
+				if info.original_position_keys is not None and info.original_position_keys > info.cs_keys:
+					self._set("beatmap_keys", f"{KEYS_PREFIX}{info.position_keys}K (fixed from {info.original_position_keys} positions)")
 				else:
-					dpg.set_value("beatmap_keys", f"Keys: {position_keys}K")
-			elif is_mania:
-				dpg.set_value("beatmap_keys", f"Keys: {keys}K")
-			else:
-				dpg.set_value("beatmap_keys", "Keys: N/A")
-		
-		if dpg.does_item_exist("beatmap_id"):
-			dpg.set_value("beatmap_id", f"Map ID: {map_id}")
-		if dpg.does_item_exist("map_error_message"):
-			if is_mania and has_error and error_message:
-				dpg.set_value("map_error_message", f"{error_message}")
-				dpg.configure_item("map_error_message", color=(255, 200, 0))
+					self._set("beatmap_keys", f"{KEYS_PREFIX}{info.position_keys}K")
+			elif info.is_mania:
+				self._set("beatmap_keys", f"{KEYS_PREFIX}{info.keys}K")
 			else:
-				dpg.set_value("map_error_message", "")
-		if dpg.does_item_exist("mode_not_supported"):
-			if not is_mania:
-				dpg.set_value("mode_not_supported", "MAP MODE NOT SUPPORTED")
+				self._set("beatmap_keys", KEYS_PREFIX + "N/A")
+			
+			self._set("beatmap_id", MAP_ID_PREFIX + str(info.map_id))
+			if info.is_mania and info.has_error and info.error_message:
+				if self._last_values.get("map_error_message") != info.error_message:
+					self._set("map_error_message", info.error_message)
+					dpg.configure_item("map_error_message", color=(255, 200, 0))
 			else:
-				dpg.set_value("mode_not_supported", "")
+				self._set("map_error_message", "")
+			self._set("mode_not_supported", "" if info.is_mania else "MAP MODE NOT SUPPORTED")
 	
 	def clear_beatmap_info(self) -> None:
-		if dpg.does_item_exist("beatmap_title"):
-			dpg.set_value("beatmap_title", "Title: None")
-		if dpg.does_item_exist("beatmap_difficulty"):
-			dpg.set_value("beatmap_difficulty", "Difficulty: None")
-		if dpg.does_item_exist("beatmap_mapper"):
-			dpg.set_value("beatmap_mapper", "Mapper: None")
-		if dpg.does_item_exist("beatmap_mode"):
-			dpg.set_value("beatmap_mode", "Mode: None")
-		if dpg.does_item_exist("beatmap_keys"):
-			dpg.set_value("beatmap_keys", "Keys: None")
-		if dpg.does_item_exist("beatmap_id"):
-			dpg.set_value("beatmap_id", "Map ID: None")
-		if dpg.does_item_exist("map_error_message"):
-			dpg.set_value("map_error_message", "")
-		if dpg.does_item_exist("mode_not_supported"):
-			dpg.set_value("mode_not_supported", "")
+		if not self._built:
+			return
+		self._last_beatmap = None
+		with dpg.mutex():
+			for tag, prefix, default in self._BEATMAP_LABELS:
+				self._set(tag, prefix + default)
+			for tag in self._BEATMAP_ERROR_TAGS:
+				self._set(tag, "")
 	
 	def update_mods(self, mods_string: str, speed_multiplier: float) -> None:
-		if dpg.does_item_exist("mods_label"):
-			dpg.set_value("mods_label", f"Mods: {mods_string}")
-		if dpg.does_item_exist("speed_label"):
-			dpg.set_value("speed_label", f"Speed: {speed_multiplier:.2f}x")
+		if not self._built:
+			return
+		key = (mods_string, speed_multiplier)
+		if key == self._last_mods:
+			return
+		self._last_mods = key
+		with dpg.mutex():
+			self._set("mods_label", MODS_PREFIX + mods_string)
+			self._set("speed_label", f"{SPEED_PREFIX}{speed_multiplier:.2f}x")
 	
 	def update_audio_time(self, audio_time_ms: int) -> None:
-		if dpg.does_item_exist("audio_time_label"):
-			minutes = audio_time_ms // 60000
-			seconds = (audio_time_ms % 60000) // 1000
-			milliseconds = audio_time_ms % 1000
-			dpg.set_value("audio_time_label", f"Audio Time: {minutes:02d}:{seconds:02d}.{milliseconds:03d}")
+		if not self._built:
+			return
+		bucket = audio_time_ms // AUDIO_TIME_RESOLUTION
+		if bucket == self._last_audio_bucket:
+			return
+		self._last_audio_bucket = bucket
+		minutes, remainder = divmod(audio_time_ms, 60000)
+		seconds, milliseconds = divmod(remainder, 1000)
+		if 0 <= minutes < 100:
+			self._set("audio_time_label", AUDIO_TIME_PREFIX + TWO_DIGITS[minutes] + ":" + TWO_DIGITS[seconds] + "." + THREE_DIGITS[milliseconds])
+		else:
+			self._set("audio_time_label", f"{AUDIO_TIME_PREFIX}{minutes:02d}:{seconds:02d}.{milliseconds:03d}")
 	
 	def update_gameplay_data(self, score: int, combo: int, max_combo: int, accuracy: float, hp: float, 
 	                          hit_300: int, hit_100: int, hit_50: int, hit_miss: int, hit_geki: int, hit_katu: int) -> None:
-		if dpg.does_item_exist("gameplay_score"):
-			dpg.set_value("gameplay_score", f"Score: {score:,}")
-		
-		if dpg.does_item_exist("gameplay_combo"):
-			dpg.set_value("gameplay_combo", f"Combo: {combo}x / {max_combo}x")
-		
-		if dpg.does_item_exist("gameplay_accuracy"):
-			dpg.set_value("gameplay_accuracy", f"Accuracy: {accuracy*100:.2f}%")
-		
-		if dpg.does_item_exist("gameplay_hp"):
-			dpg.set_value("gameplay_hp", f"HP: {hp*100:.1f}%")
-		
-		if dpg.does_item_exist("gameplay_hits"):
-			dpg.set_value("gameplay_hits", f"Hits: {hit_geki}g / {hit_300} / {hit_katu}k / {hit_100} / {hit_50} / {hit_miss}x")
+		if not self._built:
+			return
+		key = (score, combo, max_combo, accuracy, hp, hit_300, hit_100, hit_50, hit_miss, hit_geki, hit_katu)
+		if key == self._last_gameplay:
+			return
+		self._last_gameplay = key
+		with dpg.mutex():
+			self._set("gameplay_score", f"{SCORE_PREFIX}{score:,}")
+			self._set("gameplay_combo", f"{COMBO_PREFIX}{combo}x / {max_combo}x")
+			self._set("gameplay_accuracy", f"{ACCURACY_PREFIX}{accuracy*100:.2f}%")
+			self._set("gameplay_hp", f"{HP_PREFIX}{hp*100:.1f}%")
+			self._set("gameplay_hits", f"{HITS_PREFIX}{hit_geki}g / {hit_300} / {hit_katu}k / {hit_100} / {hit_50} / {hit_miss}x")
 	
 	def clear_gameplay_data(self) -> None:
-		if dpg.does_item_exist("gameplay_score"):
-			dpg.set_value("gameplay_score", "Score: N/A")
-		if dpg.does_item_exist("gameplay_combo"):
-			dpg.set_value("gameplay_combo", "Combo: N/A")
-		if dpg.does_item_exist("gameplay_accuracy"):
-			dpg.set_value("gameplay_accuracy", "Accuracy: N/A")
-		if dpg.does_item_exist("gameplay_hp"):
-			dpg.set_value("gameplay_hp", "HP: N/A")
-		if dpg.does_item_exist("gameplay_hits"):
-			dpg.set_value("gameplay_hits", "Hits: N/A")
+		if not self._built:
+			return
+		self._last_gameplay = None
+		with dpg.mutex():
+			for tag, prefix, default in self._GAMEPLAY_LABELS:
+				self._set(tag, prefix + default)
 	
 	def update_bot_status(self, status: str) -> None:
-		if dpg.does_item_exist("bot_status_label"):
-			dpg.set_value("bot_status_label", f"Bot Status: {status}")
+		if not self._built:
+			return
+		self._bot_status_text = BOT_STATUS_PREFIX + status
 	
 	def update_first_note_time(self, time_ms: int) -> None:
-		if dpg.does_item_exist("first_note_label"):
-			dpg.set_value("first_note_label", f"First Note: {time_ms} ms")
+		if not self._built:
+			return
+		self._set("first_note_label", f"{FIRST_NOTE_PREFIX}{time_ms} ms")
 	
 	def update_timing_shift(self, shift_ms: int) -> None:
-		if dpg.does_item_exist("timing_shift_input"):
-			dpg.set_value("timing_shift_input", shift_ms)
+		if self._built:
+			_set_value("timing_shift_input", shift_ms)
 	
 	def get_offset(self) -> int:
-		if dpg.does_item_exist("offset_input"):
-			return dpg.get_value("offset_input")
+		if self._built:
+			return _get_value("offset_input")
 		return 30
 	
 	def set_offset(self, value: int) -> None:
-		if dpg.does_item_exist("offset_input"):
-			dpg.set_value("offset_input", value)
+		if self._built:
+			_set_value("offset_input", value)
 	
-	def _handle_window_drag(self) -> None:
+	def _drag_begin(self, *args) -> None:
+		if self.is_dragging:
+			return
 		mouse_local_x, mouse_local_y = dpg.get_mouse_pos(local=True)
-		
-		if dpg.is_mouse_button_down(0):
-			if not self.is_dragging:
-				if 0 <= mouse_local_y <= 25:
-					self.is_dragging = True
-					self.drag_offset_x = mouse_local_x
-					self.drag_offset_y = mouse_local_y
-			
-			if self.is_dragging:
-				vp_x, vp_y = dpg.get_viewport_pos()
-				delta_x = mouse_local_x - self.drag_offset_x
-				delta_y = mouse_local_y - self.drag_offset_y
-				new_x = int(vp_x + delta_x)
-				new_y = int(vp_y + delta_y)
-				dpg.configure_viewport(self.viewport, x_pos=new_x, y_pos=new_y)
-		else:
-			self.is_dragging = False
+		if 0 <= mouse_local_y <= 25:
+			self._drag_offset = (mouse_local_x, mouse_local_y)
+			self._last_vp_pos = None
+			self.is_dragging = True
+	
+	def _drag_move(self, *args) -> None:
+		if not self.is_dragging:
+			return
+		mouse_local_x, mouse_local_y = dpg.get_mouse_pos(local=True)
+		vp_x, vp_y = dpg.get_viewport_pos()
+		offset_x, offset_y = self._drag_offset
+		new_pos = (int(vp_x + mouse_local_x - offset_x), int(vp_y + mouse_local_y - offset_y))
+		if new_pos == self._last_vp_pos:
+			return
+		self._last_vp_pos = new_pos
+		dpg.configure_viewport(self.viewport, x_pos=new_pos[0], y_pos=new_pos[1])
+	
+	def _drag_end(self, *args) -> None:
+		self.is_dragging = False
+	
+	def _mark_input(self, *args) -> None:
+		self._last_input = time.monotonic()
 	
 	def run(self) -> None:
 		self._running = True
@@ -519,27 +678,62 @@ class ManiaGUI:
 		time.sleep(0.35)
 		self.tray_manager.find_window_handle("PrismaTC")
 		
-		while dpg.is_dearpygui_running():
-			self._handle_window_drag()
-			dpg.render_dearpygui_frame()
-		dpg.destroy_context()
+		is_running = dpg.is_dearpygui_running
+		render_frame = dpg.render_dearpygui_frame
+		monotonic = time.monotonic
+		sleep = time.sleep
+		visible = self._visible
+		self._rendering = True
+		try:
+			while is_running():
+				if not visible.is_set():
+					visible.wait(timeout=0.25)
+					continue
+				now = monotonic()
+				if now - self._last_log_flush >= LOG_FLUSH_INTERVAL:
+					self._flush_logs()
+					self._last_log_flush = now
+				bot_status = self._bot_status_text
+				if bot_status is not None:
+					self._set("bot_status_label", bot_status)
+				render_frame()
+				self._fire_pending_settings(now)
+				if self._dirty or self.is_dragging or now - self._last_input < INPUT_ACTIVE_WINDOW:
+					self._dirty = False
+					sleep(0)
+				else:
+					sleep(IDLE_FRAME_SLEEP)
+		finally:
+			self._rendering = False
+			self.stop()
 	
 	def stop(self) -> None:
 		self._running = False
+		self._built = False
+		self._visible.set()
+		if self._print_thread is not None:
+			self._print_thread = None
+			self._print_queue.put_nowait(None)
 		self.tray_manager.cleanup()
 		
+		if self._destroyed:
+			return
 		if hasattr(dpg, "stop_dearpygui"):
 			dpg.stop_dearpygui()
-		dpg.destroy_context()
+		# Callbacks and the tray thread call stop() mid-loop; run() tears down once the loop exits.
+		if not self._rendering:
+			dpg.destroy_context()
+			self._destroyed = True
 	
 	def is_running(self) -> bool:
 		return self._running
 	
 	def update_osu_unlock_status(self, locked: bool, unlock_date: str = "None") -> None:
-		if dpg.does_item_exist("osu_unlock_locked_status"):
-			dpg.set_value("osu_unlock_locked_status", f"Account Locked: {locked}")
-		if dpg.does_item_exist("osu_unlock_date_status"):
-			dpg.set_value("osu_unlock_date_status", f"Unlock Date: {unlock_date}")
-		
-		if dpg.does_item_exist("osu_unlock_button"):
-			dpg.configure_item("osu_unlock_button", show=locked)
+		if not self._built:
+			return
+		with dpg.mutex():
+			self._set("osu_unlock_locked_status", f"Account Locked: {locked}")
+			self._set("osu_unlock_date_status", f"Unlock Date: {unlock_date}")
+			if locked != self._unlock_button_shown:
+				dpg.configure_item("osu_unlock_button", show=locked)
+				self._unlock_button_shown = locked
@@ -1,23 +1,37 @@
 import ctypes
+import mmap
 import os
 import sys
 import threading
 import time
+import traceback
+from array import array
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+from typing import List, Optional, Tuple
 import re
 
 import configparser
 import psutil
 
-from memory_reader import GameState, MenuMods, GameplayData, OsuMemoryReader
-from gui import ManiaGUI
+from memory_reader import GameState, MenuMods, GameplayData, OsuMemoryReader, OsuMods
+from gui import BeatmapDisplay, ManiaGUI
 from safe_print import safe_print
 from osu_unlocker import OsuUnlocker
 from startup_guard import ensure_single_instance, enable_crash_logging
 
 import keyboard
 
+try:
+	import win32gui
+	import win32process
+except ImportError:
+	win32gui = None
+	win32process = None
+
 
 class HitObject(ctypes.Structure):
 	_fields_ = [
@@ -28,6 +42,22 @@ class HitObject(ctypes.Structure):
 		("end_time", ctypes.c_int),
 	]
 
+HIT_OBJECT_FIELD_COUNT = len(HitObject._fields_)
+# x,y,time,type,hitSound[,endTime:...] -- group 5 is the hold end time when present.
+HIT_OBJECT_RE = re.compile(
+	rb"^[ \t]*([+-]?\d+)[ \t]*,[ \t]*([+-]?\d+)[ \t]*,[ \t]*([+-]?\d+)[ \t]*,[ \t]*([+-]?\d+)[ \t]*,"
+	rb"[^,\r\n]*(?:,[ \t]*([+-]?\d+)[ \t]*(?=[:,\r\n]|$))?",
+	re.MULTILINE,
+)
+SECTION_END_RE = re.compile(rb"^[ \t\r]*$", re.MULTILINE)
+MANIA_LAYOUT_RE = re.compile(r"ManiaLayouts(\d+)K")
+KEY_IDLE_POLL = 0.25
+HUMANIZE_MODIFIER_KEYS = ("shift", "alt", "ctrl", "caps lock")
+FOCUS_CACHE_TTL = 0.2
+GUI_UPDATE_INTERVAL = 1 / 60
+PAUSE_FREEZE_NS = 200_000_000
+CLICK_STOP_TIMEOUT = 2.0
+
 @dataclass
 class BeatmapSession:
 	identifier: str
@@ -37,16 +67,24 @@ class BeatmapSession:
 	path: str
 	keys: int
 	lane_positions: List[int]
-	hit_objects: List[HitObject]
+	hit_objects: ctypes.Array
 	first_hit_time: int
 	first_hit_time_original: int
+	original_timestamps: array
 	mods_string: str
 	speed_multiplier: float
 
 
+_detected_songs_dir = ""
+
+
 def auto_detect_osu_songs_dir() -> str:
+	global _detected_songs_dir
+	if _detected_songs_dir and os.path.isdir(_detected_songs_dir):
+		return _detected_songs_dir
+
 	try:
-		for process in psutil.process_iter(["pid", "name", "exe"]):
+		for process in psutil.process_iter(["name", "exe"]):
 			name = process.info.get("name")
 			if name and name.lower() == "osu!.exe":
 				exe_path = process.info.get("exe")
@@ -54,6 +92,7 @@ def auto_detect_osu_songs_dir() -> str:
 					osu_dir = os.path.dirname(exe_path)
 					songs_dir = os.path.join(osu_dir, "Songs")
 					if os.path.isdir(songs_dir):
+						_detected_songs_dir = songs_dir
 						return songs_dir
 	except Exception:
 		pass
@@ -70,55 +109,69 @@ def auto_detect_osu_songs_dir() -> str:
 	return ""
 
 
-def parse_osu_file(file_path: str, speed_multiplier: float = 1.0) -> List[HitObject]:
-	hit_objects: List[HitObject] = []
-	try:
-		with open(file_path, "r", encoding="utf-8") as osu_file:
-			in_hit_object_section = False
-			for raw_line in osu_file:
-				line = raw_line.strip()
-				if not in_hit_object_section:
-					if line == "[HitObjects]":
-						in_hit_object_section = True
-					continue
-
-				if not line:
-					break
+def hit_object_fields(hit_objects: ctypes.Array) -> memoryview:
+	return memoryview(hit_objects).cast("B").cast("i")
 
-				parts = line.split(",")
-				if len(parts) < 5:
-					continue
 
-				try:
-					x = int(parts[0])
-					y = int(parts[1])
-					timestamp = int(int(parts[2]) / speed_multiplier)
-					object_type = int(parts[3])
-				except ValueError:
-					continue
+def pack_hit_objects(rows: List[Tuple[int, int, int, int, int]]) -> ctypes.Array:
+	buffer = array("i", chain.from_iterable(rows))
+	return (HitObject * len(rows)).from_buffer(buffer)
 
-				is_hold = bool(object_type & 128)
-				end_time = timestamp
-				if is_hold and len(parts) >= 6:
-					hold_data = parts[5].split(":")[0]
-					try:
-						end_time = int(int(hold_data) / speed_multiplier)
-					except ValueError:
-						end_time = timestamp
 
-				hit_objects.append(HitObject(x, y, timestamp, object_type, end_time))
+def parse_osu_file(file_path: str, speed_multiplier: float = 1.0) -> Tuple[ctypes.Array, int]:
+	rows: List[Tuple[int, int, int, int, int]] = []
+	first_hit_time_original: Optional[int] = None
+	append = rows.append
+	scale_time = speed_multiplier != 1.0
+	in_order = True
+	last_timestamp = -sys.maxsize
+	try:
+		with open(file_path, "rb") as osu_file, mmap.mmap(osu_file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+			header = view.find(b"[HitObjects]")
+			body_start = view.find(b"\n", header) if header != -1 else -1
+			section = view[body_start + 1:] if body_start != -1 else b""
+
+		blank_line = SECTION_END_RE.search(section)
+		section_end = blank_line.start() if blank_line else len(section)
+		for match in HIT_OBJECT_RE.finditer(section, 0, section_end):
+			raw_x, raw_y, raw_timestamp, raw_type, hold_data = match.groups()
+			timestamp = int(raw_timestamp)
+			if first_hit_time_original is None:
+				first_hit_time_original = timestamp
+			if scale_time:
+				timestamp = int(timestamp / speed_multiplier)
+			object_type = int(raw_type)
+
+			end_time = timestamp
+			if object_type & 128 and hold_data:
+				end_time = int(hold_data)
+				if scale_time:
+					end_time = int(end_time / speed_multiplier)
+
+			if timestamp < last_timestamp:
+				in_order = False
+			last_timestamp = timestamp
+			append((int(raw_x), int(raw_y), timestamp, object_type, end_time))
 	except FileNotFoundError:
 		pass
 	except Exception:
 		pass
 
-	hit_objects.sort(key=lambda obj: obj.timestamp)
-	return hit_objects
+	# osu! stores hit objects chronologically; only sort files that are not.
+	if not in_order:
+		rows.sort(key=itemgetter(2))
+	return pack_hit_objects(rows), first_hit_time_original or 0
+
 
+def get_lane_positions(hit_objects: ctypes.Array) -> List[int]:
+	return sorted(set(hit_object_fields(hit_objects)[0::HIT_OBJECT_FIELD_COUNT].tolist()))
 
-def get_lane_positions(hit_objects: List[HitObject]) -> List[int]:
-	original_positions = sorted({obj.x for obj in hit_objects})
-	return original_positions
+
+def get_original_timestamps(hit_objects: ctypes.Array, speed_multiplier: float) -> array:
+	timestamps = hit_object_fields(hit_objects)[2::HIT_OBJECT_FIELD_COUNT]
+	if speed_multiplier == 1.0:
+		return array("i", timestamps)
+	return array("i", [int(timestamp * speed_multiplier) for timestamp in timestamps.tolist()])
 
 
 def map_x_to_cs_position(x: int, cs_keys: int) -> int:
@@ -127,47 +180,19 @@ def map_x_to_cs_position(x: int, cs_keys: int) -> int:
 	return min(position, cs_keys - 1)
 
 
-def remap_hit_objects_to_cs_positions(hit_objects: List[HitObject], cs_keys: int) -> List[HitObject]:
+@lru_cache(maxsize=32)
+def cs_lane_centers(cs_keys: int) -> Tuple[int, ...]:
 	position_width = 512 / cs_keys
-	remapped_objects = []
-	
-	for obj in hit_objects:
-		position_index = map_x_to_cs_position(obj.x, cs_keys)
-		new_x = int((position_index + 0.5) * position_width)
-		remapped_objects.append(
-			HitObject(
-				x=new_x,
-				y=obj.y,
-				timestamp=obj.timestamp,
-				object_type=obj.object_type,
-				end_time=obj.end_time
-			)
-		)
-	
-	return remapped_objects
+	return tuple(int((i + 0.5) * position_width) for i in range(cs_keys))
 
 
-def get_first_hit_time_original(file_path: str) -> int:
-	try:
-		with open(file_path, "r", encoding="utf-8") as osu_file:
-			in_hit_object_section = False
-			for raw_line in osu_file:
-				line = raw_line.strip()
-				if not in_hit_object_section:
-					if line == "[HitObjects]":
-						in_hit_object_section = True
-					continue
-				if not line:
-					break
-				parts = line.split(",")
-				if len(parts) >= 5:
-					try:
-						return int(parts[2])
-					except ValueError:
-						continue
-	except Exception:
-		pass
-	return 0
+def remap_hit_objects_to_cs_positions(hit_objects: ctypes.Array, cs_keys: int) -> ctypes.Array:
+	centers = cs_lane_centers(cs_keys)
+	fields = hit_object_fields(hit_objects)
+	xs = fields[0::HIT_OBJECT_FIELD_COUNT]
+	remapped_x = {x: centers[map_x_to_cs_position(x, cs_keys)] for x in set(xs.tolist())}
+	fields[0::HIT_OBJECT_FIELD_COUNT] = array("i", map(remapped_x.__getitem__, xs.tolist()))
+	return hit_objects
 
 
 class ManiaBotController:
@@ -189,12 +214,17 @@ class ManiaBotController:
 
 		self.active_session: Optional[BeatmapSession] = None
 		self.click_thread: Optional[threading.Thread] = None
+		self._click_request: Optional[Tuple[BeatmapSession, int, int, int]] = None
+		self._click_generation = 0
+		self._click_ready = threading.Condition()
+		self._click_idle = threading.Event()
+		self._click_idle.set()
 		self.script_running = False
-		self.shutdown = False
+		self.shutdown_event = threading.Event()
 		self.last_state: Optional[GameState] = None
-		self.last_log_time = 0.0
+		self.last_log_time = 0
 		self.last_timing_log = 0.0
-		self.state_lock = threading.RLock()
+		self.state_lock = threading.Lock()
 		self.play_state_entry_time = 0.0
 
 		self.resume_pending = False
@@ -203,8 +233,7 @@ class ManiaBotController:
 		self.audio_timer_stabilized = False
 
 		self.last_audio_time: Optional[int] = None
-		self.audio_freeze_start_time: Optional[float] = None
-		self.audio_freeze_value: Optional[int] = None
+		self.audio_freeze: Optional[Tuple[int, int]] = None
 		self.is_paused = False
 		self.pause_detection_enabled = False
 		self.player_died = False
@@ -228,10 +257,16 @@ class ManiaBotController:
 		self.shortcuts = self._parse_shortcuts()
 
 		if self.timing_shift:
-			self.dll.setTimingShift(ctypes.c_int(self.timing_shift))
-		self.dll.setOffset(ctypes.c_int(self.offset))
+			self.dll.setTimingShift(self.timing_shift)
+		self.dll.setOffset(self.offset)
 
 		self.keyboard_listener_thread: Optional[threading.Thread] = None
+		self._focus_cache = (0.0, False)
+		self._next_gui_update = 0.0
+		self._last_beatmap_key: Optional[tuple] = None
+
+		self.click_thread = threading.Thread(target=self._click_worker_loop, daemon=True)
+		self.click_thread.start()
 
 		safe_print("osu! Mania Bot initialized successfully!")
 
@@ -246,11 +281,8 @@ class ManiaBotController:
 		self.keyboard_listener_thread.start()
 
 	def _log(self, message: str, color: tuple = (255, 255, 255)) -> None:
-		if self.gui and hasattr(self.gui, 'log_message'):
-			try:
-				self.gui.log_message(message, color)
-			except Exception:
-				safe_print(message)
+		if self.gui:
+			self.gui.log_message(message, color)
 		else:
 			safe_print(message)
 	
@@ -272,18 +304,18 @@ class ManiaBotController:
 			self._log("Bot is not running.")
 	
 	def _gui_exit(self) -> None:
-		self.shutdown = True
+		self.shutdown_event.set()
 		self._stop_click_thread("shutdown")
 		self.reader.close_process()
 	
 	def _gui_offset_changed(self, new_offset: int) -> None:
 		self.offset = new_offset
-		self.dll.setOffset(ctypes.c_int(self.offset))
+		self.dll.setOffset(self.offset)
 		self._log(f"Offset changed to {self.offset} ms")
 	
 	def _gui_timing_shift_changed(self, new_timing_shift: int) -> None:
 		self.timing_shift = new_timing_shift
-		self.dll.setTimingShift(ctypes.c_int(self.timing_shift))
+		self.dll.setTimingShift(self.timing_shift)
 		self._log(f"Timing shift changed to {self.timing_shift} ms")
 	
 	def _gui_osu_unlock_scan(self) -> None:
@@ -293,7 +325,7 @@ class ManiaBotController:
 			self._log("osu! is not connected. Please wait for osu! to start.", color=(255, 100, 100))
 			return
 		
-		if not self.osu_unlocker.find_osu_database():
+		if not self.osu_unlocker.find_osu_database(self.reader.process_id):
 			self._log("Could not find osu!.db. Make sure osu! is running.", color=(255, 100, 100))
 			return
 		
@@ -383,14 +415,14 @@ class ManiaBotController:
 						continue
 					
 					if line.startswith('ManiaLayouts') and '=' in line:
-						parts = line.split('=', 1)
-						key_name = parts[0].strip()
-						key_value = parts[1].strip()
+						key_name, _, key_value = line.partition('=')
+						key_name = key_name.strip()
+						key_value = key_value.strip()
 						
 						if not key_value:
 							continue
 
-						match = re.search(r'ManiaLayouts(\d+)K', key_name)
+						match = MANIA_LAYOUT_RE.search(key_name)
 						if not match:
 							continue
 						
@@ -413,16 +445,14 @@ class ManiaBotController:
 								break
 						
 						if vk_codes and len(vk_codes) == mode_number:
-							custom_keybinds[mode_number] = vk_codes
+							custom_keybinds[mode_number] = (ctypes.c_uint16 * len(vk_codes))(*vk_codes)
 							safe_print(f"Loaded keybind for {mode_number}K from osu! config: {key_chars}")
 			
 			if custom_keybinds:
 				safe_print(f"Loaded {len(custom_keybinds)} keybind configurations from osu! config")
 			
 		except Exception as e:
-			safe_print(f"Error reading osu! config for keybinds: {e}")
-			import traceback
-			traceback.print_exc()
+			safe_print(f"Error reading osu! config for keybinds: {e!r}")
 		
 		return custom_keybinds
 	
@@ -526,9 +556,7 @@ class ManiaBotController:
 						shortcuts["toggle_bot"] = normalized
 					
 		except Exception as e:
-			safe_print(f"Error parsing shortcuts: {e}")
-			import traceback
-			traceback.print_exc()
+			safe_print(f"Error parsing shortcuts: {e!r}")
 		
 		return shortcuts
 
@@ -549,6 +577,7 @@ class ManiaBotController:
 			ctypes.c_int,
 			ctypes.POINTER(ctypes.c_uint16),
 		)
+		dll.clickHitObjects.restype = None
 		dll.setStopClicking.argtypes = [ctypes.c_bool]
 		dll.setTimingShift.argtypes = [ctypes.c_int]
 		dll.setOffset.argtypes = [ctypes.c_int]
@@ -573,7 +602,6 @@ class ManiaBotController:
 				self.gui.run()
 			except Exception as e:
 				safe_print(f"GUI ERROR: {e}")
-				import traceback
 				traceback.print_exc()
 				input("Press Enter to exit...")
 		else:
@@ -582,7 +610,7 @@ class ManiaBotController:
 	def _run_bot_logic(self) -> None:
 		self._log("Mania bot started. Waiting for osu!...")
 		try:
-			while not self.shutdown:
+			while not self.shutdown_event.is_set():
 				if not self._ensure_reader_ready():
 					self._sleep_with_stop(1.0)
 					continue
@@ -596,20 +624,24 @@ class ManiaBotController:
 		except KeyboardInterrupt:
 			self._log("Stopping bot...")
 		finally:
-			self.shutdown = True
+			self.shutdown_event.set()
 			self._stop_click_thread("shutdown")
 			self.reader.close_process()
 
 	def _sleep_with_stop(self, seconds: float) -> None:
-		end_time = time.time() + seconds
-		while not self.shutdown and time.time() < end_time:
-			time.sleep(0.05)
+		self.shutdown_event.wait(seconds)
 
 	def _is_osu_focused(self) -> bool:
+		now = time.monotonic()
+		checked_at, focused = self._focus_cache
+		if now - checked_at < FOCUS_CACHE_TTL:
+			return focused
+		focused = self._query_osu_focused()
+		self._focus_cache = (now, focused)
+		return focused
+
+	def _query_osu_focused(self) -> bool:
 		try:
-			import win32gui
-			import win32process
-
 			if not self.reader or not self.reader.process_id:
 				return False
 			
@@ -645,6 +677,28 @@ class ManiaBotController:
 		except Exception:
 			return False
 
+	def _shortcut_scan_codes(self) -> Optional[frozenset]:
+		alt_keys = {"[": "oem_4", "]": "oem_6", ";": "oem_1"}
+		scan_codes = set()
+		for key_name in chain(self.shortcuts.values(), HUMANIZE_MODIFIER_KEYS):
+			normalized = self._normalize_shortcut_key(key_name)
+			if not normalized:
+				continue
+			for candidate in (normalized, alt_keys.get(normalized)):
+				if not candidate:
+					continue
+				try:
+					for step in keyboard.parse_hotkey(candidate):
+						for codes in step:
+							scan_codes.update(codes)
+					break
+				except Exception:
+					continue
+			else:
+				# Unresolvable key: fall back to waking on every key event.
+				return None
+		return frozenset(scan_codes)
+
 	def _keyboard_listener(self) -> None:
 		if keyboard is None:
 			return
@@ -661,7 +715,30 @@ class ManiaBotController:
 			"humanize_press_later": False
 		}
 		
-		while not self.shutdown:
+		key_event = threading.Event()
+		key_event.set()
+		# Only shortcut keys wake the poller; the bot's own SendInput presses land on other keys.
+		watched_scan_codes = self._shortcut_scan_codes()
+
+		def on_key_event(event) -> None:
+			if watched_scan_codes is None or event.scan_code in watched_scan_codes:
+				key_event.set()
+
+		try:
+			hook = keyboard.hook(on_key_event)
+		except Exception as exc:
+			self._log(f"Keyboard listener halted: {exc}")
+			return
+		try:
+			self._poll_shortcuts(key_states, key_event)
+		finally:
+			keyboard.unhook(hook)
+
+	def _poll_shortcuts(self, key_states: dict, key_event: threading.Event) -> None:
+		while not self.shutdown_event.is_set():
+			# Key states only change on key events; the timeout re-checks focus and game state.
+			key_event.wait(KEY_IDLE_POLL)
+			key_event.clear()
 			try:
 				if self._is_osu_focused():
 					toggle_key = self.shortcuts["toggle_bot"]
@@ -690,14 +767,13 @@ class ManiaBotController:
 				if not shortcuts_enabled:
 					for key in key_states:
 						key_states[key] = False
-					time.sleep(0.05)
 					continue
 
 				ts_dec_key = self.shortcuts["timing_shift_decrease"]
 				ts_dec_pressed = self._safe_is_pressed(ts_dec_key)
 				if ts_dec_pressed and not key_states["timing_shift_decrease"]:
 					self.timing_shift -= 1
-					self.dll.setTimingShift(ctypes.c_int(self.timing_shift))
+					self.dll.setTimingShift(self.timing_shift)
 					self._log(f"Timing shift: {self.timing_shift} ms (earlier)", color=(100, 200, 255))
 					if self.gui:
 						try:
@@ -710,7 +786,7 @@ class ManiaBotController:
 				ts_inc_pressed = self._safe_is_pressed(ts_inc_key)
 				if ts_inc_pressed and not key_states["timing_shift_increase"]:
 					self.timing_shift += 1
-					self.dll.setTimingShift(ctypes.c_int(self.timing_shift))
+					self.dll.setTimingShift(self.timing_shift)
 					self._log(f"Timing shift: {self.timing_shift} ms (later)", color=(100, 200, 255))
 					if self.gui:
 						try:
@@ -723,7 +799,7 @@ class ManiaBotController:
 				offset_dec_pressed = self._safe_is_pressed(offset_dec_key)
 				if offset_dec_pressed and not key_states["offset_decrease"]:
 					self.offset = max(0, self.offset - 1)
-					self.dll.setOffset(ctypes.c_int(self.offset))
+					self.dll.setOffset(self.offset)
 					self._log(f"Offset: {self.offset} ms", color=(100, 255, 100))
 					if self.gui:
 						try:
@@ -736,7 +812,7 @@ class ManiaBotController:
 				offset_inc_pressed = self._safe_is_pressed(offset_inc_key)
 				if offset_inc_pressed and not key_states["offset_increase"]:
 					self.offset += 1
-					self.dll.setOffset(ctypes.c_int(self.offset))
+					self.dll.setOffset(self.offset)
 					self._log(f"Offset: {self.offset} ms", color=(100, 255, 100))
 					if self.gui:
 						try:
@@ -747,7 +823,7 @@ class ManiaBotController:
 				
 				shift_pressed = self._safe_is_pressed('shift')
 				if shift_pressed != key_states["humanize_offset_boost"]:
-					self.dll.setHumanizeOffsetBoost(ctypes.c_bool(shift_pressed))
+					self.dll.setHumanizeOffsetBoost(shift_pressed)
 					if shift_pressed:
 						self._log("Humanize: Offset +50% ACTIVE (SHIFT)", color=(255, 200, 100))
 						if self.gui:
@@ -761,7 +837,7 @@ class ManiaBotController:
 				
 				alt_pressed = self._safe_is_pressed('alt')
 				if alt_pressed != key_states["humanize_force_miss"]:
-					self.dll.setHumanizeForceMiss(ctypes.c_bool(alt_pressed))
+					self.dll.setHumanizeForceMiss(alt_pressed)
 					if alt_pressed:
 						self._log("Humanize: Force miss ACTIVE (ALT)", color=(255, 100, 100))
 					else:
@@ -770,7 +846,7 @@ class ManiaBotController:
 				
 				ctrl_pressed = self._safe_is_pressed('ctrl')
 				if ctrl_pressed != key_states["humanize_press_sooner"]:
-					self.dll.setHumanizePressSooner(ctypes.c_bool(ctrl_pressed))
+					self.dll.setHumanizePressSooner(ctrl_pressed)
 					if ctrl_pressed:
 						self._log("Humanize: Press 10% sooner ACTIVE (CTRL)", color=(100, 200, 255))
 					else:
@@ -779,14 +855,12 @@ class ManiaBotController:
 				
 				caps_pressed = self._safe_is_pressed('caps lock')
 				if caps_pressed != key_states["humanize_press_later"]:
-					self.dll.setHumanizePressLater(ctypes.c_bool(caps_pressed))
+					self.dll.setHumanizePressLater(caps_pressed)
 					if caps_pressed:
 						self._log("Humanize: Press 10% later ACTIVE (CAPS)", color=(255, 150, 200))
 					else:
 						self._log("Humanize: Press 10% later deactivated", color=(150, 150, 150))
 					key_states["humanize_press_later"] = caps_pressed
-				
-				time.sleep(0.05)
 			except RuntimeError as exc:
 				self._log(f"Keyboard listener halted: {exc}")
 				break
@@ -841,6 +915,11 @@ class ManiaBotController:
 		return True
 
 	def _tick(self) -> None:
+		now = time.monotonic()
+		refresh_gui = self.gui is not None and now >= self._next_gui_update
+		if refresh_gui:
+			self._next_gui_update = now + GUI_UPDATE_INTERVAL
+
 		state = self.reader.get_game_state()
 		if state and state != self.last_state:
 			self._log(f"Game state changed: {state.name}")
@@ -853,8 +932,7 @@ class ManiaBotController:
 				self.pause_detection_enabled = False
 				self.is_paused = False
 				self.last_audio_time = None
-				self.audio_freeze_start_time = None
-				self.audio_freeze_value = None
+				self.audio_freeze = None
 				self.resume_pending = False
 			else:
 				self.play_state_entry_time = time.time()
@@ -862,27 +940,26 @@ class ManiaBotController:
 				self.pause_detection_enabled = False
 				self.is_paused = False
 				self.last_audio_time = None
-				self.audio_freeze_start_time = None
-				self.audio_freeze_value = None
+				self.audio_freeze = None
 				self.resume_pending = False
 				self.player_died = False
 				self._log("Entered PLAY state. Waiting for audio timer to stabilize...")
 			self.last_state = state
 
 		audio_time = self.reader.get_audio_time()
-		if audio_time is not None and self.gui:
+		if audio_time is not None and refresh_gui:
 			self.gui.update_audio_time(audio_time)
 
 		mods = self.reader.get_menu_mods()
 		beatmap = self.reader.get_beatmap_info()
 
-		if self.gui and mods:
+		if refresh_gui and mods:
 			self.gui.update_mods(mods.mods_string, mods.speed_multiplier)
 		
 		if state == GameState.PLAY:
 			gameplay = self.reader.get_gameplay_data()
 			if gameplay:
-				if self.gui:
+				if refresh_gui:
 					self.gui.update_gameplay_data(
 						score=gameplay.score,
 						combo=gameplay.combo,
@@ -900,7 +977,6 @@ class ManiaBotController:
 				if gameplay.hp <= 0.0 and not self.player_died:
 					has_nofail = False
 					if mods:
-						from memory_reader import OsuMods
 						has_nofail = bool(mods.mods_number & OsuMods.NO_FAIL)
 					
 					if not has_nofail:
@@ -911,18 +987,31 @@ class ManiaBotController:
 						if self.gui:
 							self.gui.update_bot_status("Stopped (Player Died)")
 		else:
-			if self.gui:
+			if refresh_gui:
 				self.gui.clear_gameplay_data()
 			self.player_died = False
 
 		if beatmap and beatmap.filename:
+			beatmap_key = (
+				beatmap.folder, beatmap.filename, beatmap.map_id, beatmap.beatmap_mode,
+				mods.speed_multiplier if mods else 1.0,
+			)
+		else:
+			beatmap_key = None
+		if beatmap_key is None:
+			self._last_beatmap_key = None
+			self.active_session = None
+			self.last_timing_log = 0.0
+		# An unchanged map only needs another pass while a mania session has yet to be prepared.
+		elif beatmap_key != self._last_beatmap_key or (beatmap.beatmap_mode == 3 and not self.active_session):
+			self._last_beatmap_key = beatmap_key
 			identifier = f"{beatmap.folder}/{beatmap.filename}"
 			if beatmap.beatmap_mode != 3:
 				if self.gui:
 					mode_names = {0: "osu!standard", 1: "Taiko", 2: "Catch", 3: "Mania"}
 					mode_name = mode_names.get(beatmap.beatmap_mode, f"Unknown ({beatmap.beatmap_mode})")
 					
-					self.gui.update_beatmap_info(
+					self.gui.update_beatmap_info(BeatmapDisplay(
 						title=f"{beatmap.artist} - {beatmap.title}",
 						difficulty=beatmap.difficulty,
 						mapper=beatmap.creator,
@@ -930,7 +1019,7 @@ class ManiaBotController:
 						keys=0,
 						map_id=beatmap.map_id,
 						is_mania=False
-					)
+					))
 					self.gui.update_bot_status("Idle (non-mania map)")
 				
 				if self.active_session:
@@ -951,9 +1040,6 @@ class ManiaBotController:
 
 				if needs_refresh:
 					self._prepare_session(beatmap, mods)
-		else:
-			self.active_session = None
-			self.last_timing_log = 0.0
 
 		if state != GameState.PLAY:
 			if self.is_paused:
@@ -1007,8 +1093,8 @@ class ManiaBotController:
 			time_to_resume_target = self.resume_target_time - audio_time
 			
 			if abs(time_to_resume_target) <= 20:
-				self.resume_pending = False
-				self._start_click_thread_from_position(audio_time, self.resume_target_index, time_to_resume_target)
+				if self._start_click_thread_from_position(audio_time, self.resume_target_index, time_to_resume_target):
+					self.resume_pending = False
 			return
 
 		time_to_first = self.active_session.first_hit_time_original - audio_time
@@ -1045,7 +1131,7 @@ class ManiaBotController:
 		speed_multiplier = mods.speed_multiplier if mods else 1.0
 		mods_string = mods.mods_string if mods else "NM"
 
-		hit_objects = parse_osu_file(map_path, speed_multiplier)
+		hit_objects, first_hit_time_original = parse_osu_file(map_path, speed_multiplier)
 		if not hit_objects:
 			self._log("No hit objects parsed from beatmap. Waiting for next map.", color=(255, 0, 0))
 			self.active_session = None
@@ -1062,12 +1148,7 @@ class ManiaBotController:
 		
 		if has_map_bug:
 			hit_objects = remap_hit_objects_to_cs_positions(hit_objects, cs_keys)
-			
-			position_width = 512 / cs_keys
-			lane_positions = []
-			for i in range(cs_keys):
-				position_center = int((i + 0.5) * position_width)
-				lane_positions.append(position_center)
+			lane_positions = list(cs_lane_centers(cs_keys))
 			
 			keys = cs_keys
 			position_keys = cs_keys
@@ -1079,7 +1160,6 @@ class ManiaBotController:
 				keys = position_keys
 		
 		first_hit_time = hit_objects[0].timestamp
-		first_hit_time_original = get_first_hit_time_original(map_path)
 
 		identifier = f"{beatmap.folder}/{beatmap.filename}"
 		self.active_session = BeatmapSession(
@@ -1093,6 +1173,7 @@ class ManiaBotController:
 			hit_objects=hit_objects,
 			first_hit_time=first_hit_time,
 			first_hit_time_original=first_hit_time_original,
+			original_timestamps=get_original_timestamps(hit_objects, speed_multiplier),
 			mods_string=mods_string,
 			speed_multiplier=speed_multiplier,
 		)
@@ -1112,7 +1193,7 @@ class ManiaBotController:
 			if has_map_bug:
 				error_message = f"Map fixed: {original_position_keys} positions -> {cs_keys}K"
 			
-			self.gui.update_beatmap_info(
+			self.gui.update_beatmap_info(BeatmapDisplay(
 				title=self.active_session.title,
 				difficulty=beatmap.difficulty,
 				mapper=beatmap.creator,
@@ -1124,28 +1205,34 @@ class ManiaBotController:
 				original_position_keys=original_position_keys if has_map_bug else None,
 				has_error=has_map_bug,
 				error_message=error_message
-			)
+			))
 			self.gui.update_first_note_time(first_hit_time_original)
 			self.gui.update_bot_status("Ready - Waiting for PLAY state")
 
 	def _start_click_thread(self, audio_time: int, delta_to_first: int) -> None:
 		self._start_click_thread_from_position(audio_time, 0, delta_to_first)
 	
-	def _start_click_thread_from_position(self, audio_time: int, start_index: int = 0, delta_to_first: int = 0) -> None:
+	def _start_click_thread_from_position(self, audio_time: int, start_index: int = 0, delta_to_first: int = 0) -> bool:
 		with self.state_lock:
 			if not self.active_session or self.script_running or not self.active_session.hit_objects:
-				return
+				return False
+			if not self._click_idle.is_set():
+				# A previous clickHitObjects call is still running; queuing now would start with a stale baseline.
+				self._throttled_log("Previous bot run is still stopping. Waiting...")
+				return False
 			session_snapshot = self.active_session
 			self.script_running = True
+			self._click_generation += 1
+			generation = self._click_generation
 
 		start_adjustment = int(audio_time / session_snapshot.speed_multiplier)
 		
 		if start_index == 0:
 			self._log(f"=== BOT STARTED === Audio: {audio_time} ms | Δ: {delta_to_first} ms")
 		else:
-			target_note = session_snapshot.hit_objects[start_index] if start_index < len(session_snapshot.hit_objects) else None
-			if target_note:
-				target_time_original = int(target_note.timestamp * session_snapshot.speed_multiplier)
+			original_timestamps = session_snapshot.original_timestamps
+			if start_index < len(original_timestamps):
+				target_time_original = original_timestamps[start_index]
 				self._log(f"=== BOT RESUMED === From note index {start_index} | Audio: {audio_time} ms | Target note: {target_time_original} ms", color=(100, 255, 100))
 			else:
 				self._log(f"=== BOT RESUMED === From note index {start_index} | Audio: {audio_time} ms", color=(100, 255, 100))
@@ -1153,70 +1240,80 @@ class ManiaBotController:
 		if self.gui:
 			self.gui.update_bot_status("Running")
 
-		self.dll.setOffset(ctypes.c_int(self.offset))
-		self.dll.setTimingShift(ctypes.c_int(self.timing_shift))
-		self.dll.setStopClicking(ctypes.c_bool(False))
+		self.dll.setOffset(self.offset)
+		self.dll.setTimingShift(self.timing_shift)
+		self.dll.setStopClicking(False)
 
-		def worker(session: BeatmapSession, start_time_adjustment: int, from_index: int) -> None:
-			try:
-				total = len(session.hit_objects) - from_index
-				if total <= 0:
-					self._log("No notes to play from this position.")
-					return
-				
-				array_type = HitObject * total
-				hit_array = array_type(*session.hit_objects[from_index:])
-				
-				custom_keys_ptr = None
-				if session.keys in self.custom_keybinds:
-					vk_codes = self.custom_keybinds[session.keys]
-					custom_keys_array = (ctypes.c_uint16 * len(vk_codes))(*vk_codes)
-					custom_keys_ptr = ctypes.cast(custom_keys_array, ctypes.POINTER(ctypes.c_uint16))
-				
-				self.dll.clickHitObjects(
-					hit_array,
-					ctypes.c_int(total),
-					ctypes.c_int(0),
-					ctypes.c_int(0),
-					ctypes.c_int(start_time_adjustment),
-					ctypes.c_bool(True),
-					ctypes.c_int(self.offset),
-					ctypes.c_int(session.keys),
-					custom_keys_ptr,
-				)
-				self._log("Bot execution completed.")
-			except Exception as exc:
-				self._log(f"Error while running bot: {exc}")
-			finally:
-				self.dll.setStopClicking(ctypes.c_bool(False))
-				with self.state_lock:
-					self.script_running = False
-					self.click_thread = None
-				if self.gui:
-					self.gui.update_bot_status("Idle")
+		with self._click_ready:
+			self._click_idle.clear()
+			self._click_request = (session_snapshot, start_adjustment, start_index, generation)
+			self._click_ready.notify()
+		return True
 
-		thread = threading.Thread(
-			target=worker,
-			args=(session_snapshot, start_adjustment, start_index),
-			daemon=True,
-		)
-		with self.state_lock:
-			self.click_thread = thread
-		thread.start()
+	def _click_worker_loop(self) -> None:
+		while True:
+			with self._click_ready:
+				while self._click_request is None:
+					self._click_ready.wait()
+				request = self._click_request
+				self._click_request = None
+			self._play_session(*request)
+
+	def _play_session(self, session: BeatmapSession, start_time_adjustment: int, from_index: int, generation: int) -> None:
+		try:
+			total = len(session.hit_objects) - from_index
+			if total <= 0:
+				self._log("No notes to play from this position.")
+				return
+			
+			hit_array = session.hit_objects
+			if from_index:
+				hit_array = (HitObject * total).from_buffer(hit_array, from_index * ctypes.sizeof(HitObject))
+			
+			custom_keys_ptr = self.custom_keybinds.get(session.keys)
+			
+			self.dll.clickHitObjects(
+				hit_array,
+				total,
+				0,
+				0,
+				start_time_adjustment,
+				True,
+				self.offset,
+				session.keys,
+				custom_keys_ptr,
+			)
+			self._log("Bot execution completed.")
+		except Exception as exc:
+			self._log(f"Error while running bot: {exc}")
+		finally:
+			# A run that outlived a timed-out stop must not clear the state of the run queued after it.
+			with self.state_lock:
+				is_current = generation == self._click_generation
+				if is_current:
+					self.script_running = False
+					self._click_idle.set()
+			if is_current and self.gui:
+				self.gui.update_bot_status("Idle")
 
 	def _stop_click_thread(self, reason: str) -> None:
 		with self.state_lock:
 			if not self.script_running:
 				return
-			thread = self.click_thread
 			self.script_running = False
-			self.click_thread = None
+
+		with self._click_ready:
+			if self._click_request is not None:
+				self._click_request = None
+				self._click_idle.set()
 
 		self._log(f"Stopping bot ({reason})...")
-		self.dll.setStopClicking(ctypes.c_bool(True))
-		if thread and thread.is_alive():
-			thread.join(timeout=2.0)
-		self.dll.setStopClicking(ctypes.c_bool(False))
+		self.dll.setStopClicking(True)
+		if self._click_idle.wait(timeout=CLICK_STOP_TIMEOUT):
+			self.dll.setStopClicking(False)
+		else:
+			# Leave stopClicking set so the stuck call cannot keep pressing keys; the next start clears it.
+			self._log("Click worker did not stop in time.", color=(255, 200, 0))
 		self.last_timing_log = 0.0
 		
 		if reason != "pause detected":
@@ -1226,32 +1323,33 @@ class ManiaBotController:
 			self.gui.update_bot_status("Stopped")
 
 	def _detect_pause(self, audio_time: int) -> None:
-		now = time.time()
-		
-		if self.last_audio_time is None:
+		last_audio_time = self.last_audio_time
+		if last_audio_time is None:
 			self.last_audio_time = audio_time
 			return
 		
-		audio_delta = audio_time - self.last_audio_time
+		audio_delta = audio_time - last_audio_time
+		
+		if audio_delta > 0 and not self.is_paused:
+			if self.audio_freeze is not None:
+				self.audio_freeze = None
+			self.last_audio_time = audio_time
+			return
 		
 		if audio_delta > 0:
-			if self.is_paused:
-				self._log(f"[PAUSE] Detected UNPAUSE - Audio resumed from {audio_time} ms (delta: +{audio_delta}ms)", color=(100, 255, 100))
-				self.audio_freeze_start_time = None
-				self.audio_freeze_value = None
-				self._handle_unpause(audio_time)
-			else:
-				self.audio_freeze_start_time = None
-				self.audio_freeze_value = None
+			self._log(f"[PAUSE] Detected UNPAUSE - Audio resumed from {audio_time} ms (delta: +{audio_delta}ms)", color=(100, 255, 100))
+			self.audio_freeze = None
+			self._handle_unpause(audio_time)
 		
 		elif audio_delta == 0:
 			if not self.is_paused:
-				if self.audio_freeze_start_time is None:
-					self.audio_freeze_start_time = now
-					self.audio_freeze_value = audio_time
+				now = time.monotonic_ns()
+				audio_freeze = self.audio_freeze
+				if audio_freeze is None:
+					self.audio_freeze = (now, audio_time)
 				else:
-					freeze_duration = now - self.audio_freeze_start_time
-					if freeze_duration >= 0.2:
+					freeze_duration = now - audio_freeze[0]
+					if freeze_duration >= PAUSE_FREEZE_NS:
 						self._log(f"[PAUSE] Detected PAUSE at {audio_time} ms", color=(255, 255, 0))
 						self.is_paused = True
 						
@@ -1263,11 +1361,10 @@ class ManiaBotController:
 							self.gui.update_bot_status("Paused")
 		
 		elif audio_delta < -100 or audio_time <= 0:
-			self._log(f"[PAUSE] Detected RESTART - Audio jumped from {self.last_audio_time} to {audio_time} ms", color=(255, 150, 0))
+			self._log(f"[PAUSE] Detected RESTART - Audio jumped from {last_audio_time} to {audio_time} ms", color=(255, 150, 0))
 			self._handle_restart()
 			
-			self.audio_freeze_start_time = None
-			self.audio_freeze_value = None
+			self.audio_freeze = None
 			self.is_paused = False
 		
 		self.last_audio_time = audio_time
@@ -1278,21 +1375,16 @@ class ManiaBotController:
 		
 		self.is_paused = False
 		
-		next_note_index = 0
-		next_note_time = 0
-		for i, hit_obj in enumerate(self.active_session.hit_objects):
-			original_timestamp = int(hit_obj.timestamp * self.active_session.speed_multiplier)
-			if original_timestamp > audio_time:
-				next_note_index = i
-				next_note_time = original_timestamp
-				break
+		original_timestamps = self.active_session.original_timestamps
+		next_note_index = bisect_right(original_timestamps, audio_time)
 		
-		if next_note_index >= len(self.active_session.hit_objects):
+		if next_note_index >= len(original_timestamps):
 			self._log(f"[PAUSE] No more notes to play after unpause", color=(255, 200, 0))
 			if self.gui:
 				self.gui.update_bot_status("Completed")
 			return
 		
+		next_note_time = original_timestamps[next_note_index]
 		self.resume_pending = True
 		self.resume_target_index = next_note_index
 		self.resume_target_time = next_note_time
@@ -1317,8 +1409,8 @@ class ManiaBotController:
 			self.gui.update_bot_status("Ready - Waiting for audio sync...")
 	
 	def _throttled_log(self, message: str, interval: float = 5.0) -> None:
-		now = time.time()
-		if now - self.last_log_time >= interval:
+		now = time.monotonic_ns()
+		if now - self.last_log_time >= int(interval * 1e9):
 			self._log(message)
 			self.last_log_time = now
 
@@ -1333,7 +1425,6 @@ if __name__ == "__main__":
 		controller.run()
 	except Exception as e:
 		safe_print(f"\nFATAL ERROR: {e}")
-		import traceback
 		traceback.print_exc()
 		input("\nPress Enter to exit...")
 
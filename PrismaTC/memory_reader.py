@@ -1,10 +1,12 @@
 import ctypes
 import ctypes.wintypes as wintypes
 import struct
-from typing import Optional, Tuple, List
+from typing import Dict, Optional, Tuple, List
 from dataclasses import dataclass
 from enum import IntEnum
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
+import mmap
+import re
 import time
 import os
 import psutil
@@ -15,6 +17,18 @@ PROCESS_ALL_ACCESS = 0x1F0FFF
 PROCESS_VM_READ = 0x0010
 PROCESS_QUERY_INFORMATION = 0x0400
 TH32CS_SNAPPROCESS = 0x00000002
+SCAN_CHUNK_SIZE = 1 << 20
+BEATMAP_STRUCT_SIZE = 0x130
+CSHARP_STRING_PREFETCH = 128
+UINT8 = struct.Struct('<B')
+UINT16 = struct.Struct('<H')
+UINT32 = struct.Struct('<I')
+FLOAT32 = struct.Struct('<f')
+FLOAT64 = struct.Struct('<d')
+MODE_LINE_RE = re.compile(rb"^[ \t]*Mode ?:(.*)$", re.MULTILINE)
+DIFFICULTY_SECTION_RE = re.compile(rb"^[ \t]*\[Difficulty\][ \t\r]*$", re.MULTILINE)
+_local_appdata = os.environ.get("LOCALAPPDATA", "")
+SIGNATURE_CACHE_PATH = os.path.join(_local_appdata, "PrismaTC", "sig_cache.json") if _local_appdata else ""
 
 class PROCESSENTRY32(ctypes.Structure):
     _fields_ = [
@@ -139,37 +153,42 @@ MOD_ORDER = {
 }
 
 
+MOD_BY_BIT = {1 << bit_index: name for bit_index, name in enumerate(MOD_BIT_VALUES)}
+MOD_SORT_KEYS = {name: MOD_ORDER.get(name.lower(), 99) for name in MOD_BIT_VALUES}
+ALL_MOD_BITS = (1 << len(MOD_BIT_VALUES)) - 1
+# NC, PF and CN are always set together with the mod they extend; only the stronger one is shown.
+IMPLIED_MODS = (
+    (OsuMods.NIGHTCORE, OsuMods.DOUBLE_TIME),
+    (OsuMods.PERFECT, OsuMods.SUDDEN_DEATH),
+    (OsuMods.CINEMA, OsuMods.AUTOPLAY),
+)
+
+
 def parse_mods(mods_number: int, ordered: bool = True) -> Tuple[str, List[str], float]:
     if mods_number == 0:
         return ('', [], 1.0)
     
-    mods_list = []
-    
-    for bit_index in range(31):
-        bit_value = 1 << bit_index
-        if mods_number & bit_value:
-            if bit_index < len(MOD_BIT_VALUES):
-                mods_list.append(MOD_BIT_VALUES[bit_index])
-    
     speed_multiplier = 1.0
-    if 'DT' in mods_list or 'NC' in mods_list:
+    if mods_number & (OsuMods.DOUBLE_TIME | OsuMods.NIGHTCORE):
         speed_multiplier = 1.5
-    elif 'HT' in mods_list:
+    elif mods_number & OsuMods.HALF_TIME:
         speed_multiplier = 0.75
-    if ordered:
-        mods_list.sort(key=lambda x: MOD_ORDER.get(x.lower(), 99))
     
-    mods_string = ''.join(mods_list)
-    mods_string = mods_string.replace('DTNC', 'NC').replace('NCDT', 'NC')
-    mods_string = mods_string.replace('SDPF', 'PF').replace('PFSD', 'PF')
-    mods_string = mods_string.replace('ATCN', 'CN').replace('CNAT', 'CN')
-
-    if mods_string:
-        mods_array = [mods_string[i:i+2] for i in range(0, len(mods_string), 2)]
-    else:
-        mods_array = []
+    remaining = mods_number & ALL_MOD_BITS
+    for mod, implied in IMPLIED_MODS:
+        if remaining & mod:
+            remaining &= ~implied
+    
+    mods_list = []
+    while remaining:
+        lowest_bit = remaining & -remaining
+        mods_list.append(MOD_BY_BIT[lowest_bit])
+        remaining ^= lowest_bit
+    
+    if ordered:
+        mods_list.sort(key=MOD_SORT_KEYS.__getitem__)
     
-    return (mods_string, mods_array, speed_multiplier)
+    return (''.join(mods_list), mods_list, speed_multiplier)
 
 
 @dataclass
@@ -178,6 +197,9 @@ class Pattern:
     signature: bytes
     mask: bytes
     offset: int = 0
+    segments: Tuple[Tuple[int, bytes], ...] = ()
+    anchor: bytes = b''
+    anchor_offset: int = 0
 
 
 @dataclass
@@ -234,6 +256,8 @@ class OsuMemoryReader:
         self.base_addresses: dict = {}
         self.debug = debug
         self._songs_folder_cache: Optional[str] = None
+        self._exe_path_cache: Optional[Tuple[int, str]] = None
+        self._beatmap_mode_cache: Dict[Tuple[str, str], int] = {}
 
         self.patterns = {
             'baseAddr': self._create_pattern('F8 01 74 04 83 65'),
@@ -247,12 +271,28 @@ class OsuMemoryReader:
         
         self.kernel32 = ctypes.windll.kernel32
         self.psapi = ctypes.windll.psapi
+        self._small_buffer = ctypes.create_string_buffer(8)
+        self._small_bytes_read = ctypes.c_size_t(0)
     
     def _create_pattern(self, pattern_str: str, offset: int = 0) -> Pattern:
         bytes_list = pattern_str.split(' ')
         signature = bytes([int(b, 16) if b != '??' else 0x00 for b in bytes_list])
         mask = bytes([0x01 if b != '??' else 0x00 for b in bytes_list])
-        return Pattern('', signature, mask, offset)
+        segments = []
+        start = None
+        for i, fixed in enumerate(mask + b'\x00'):
+            if fixed and start is None:
+                start = i
+            elif not fixed and start is not None:
+                segments.append((start, signature[start:i]))
+                start = None
+        # 0x00/0xFF fill most of the address space, so anchor on the segment with the most other bytes.
+        anchor_offset, anchor = max(
+            segments,
+            key=lambda segment: (sum(b not in (0x00, 0xFF) for b in segment[1]), len(segment[1])),
+            default=(0, b''),
+        )
+        return Pattern('', signature, mask, offset, tuple(segments), anchor, anchor_offset)
     
     def find_process(self, process_name: str = "osu!.exe") -> Optional[int]:
         snapshot = self.kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
@@ -303,23 +343,30 @@ class OsuMemoryReader:
             return buffer.raw
         return None
     
-    def read_int(self, address: int) -> Optional[int]:
-        data = self.read_memory(address, 4)
-        if data:
-            return struct.unpack('<I', data)[0]
+    def _read_small(self, address: int, value: struct.Struct):
+        if not self.process_handle:
+            return None
+        
+        success = self.kernel32.ReadProcessMemory(
+            self.process_handle,
+            ctypes.c_void_p(address),
+            self._small_buffer,
+            value.size,
+            ctypes.byref(self._small_bytes_read)
+        )
+        
+        if success and self._small_bytes_read.value == value.size:
+            return value.unpack_from(self._small_buffer)[0]
         return None
     
+    def read_int(self, address: int) -> Optional[int]:
+        return self._read_small(address, UINT32)
+    
     def read_float(self, address: int) -> Optional[float]:
-        data = self.read_memory(address, 4)
-        if data:
-            return struct.unpack('<f', data)[0]
-        return None
+        return self._read_small(address, FLOAT32)
     
     def read_byte(self, address: int) -> Optional[int]:
-        data = self.read_memory(address, 1)
-        if data:
-            return struct.unpack('<B', data)[0]
-        return None
+        return self._read_small(address, UINT8)
     
     def read_pointer(self, address: int) -> Optional[int]:
         ptr1 = self.read_int(address)
@@ -332,11 +379,19 @@ class OsuMemoryReader:
         if not address or address == 0:
             return None
         
-        length = self.read_int(address + 0x4)
+        # Most strings fit in one read together with their header; longer ones need a second read.
+        prefetched = self.read_memory(address, 0x8 + CSHARP_STRING_PREFETCH * 2)
+        if prefetched:
+            length = UINT32.unpack_from(prefetched, 0x4)[0]
+        else:
+            length = self.read_int(address + 0x4)
         if not length or length <= 0 or length > 1000:
             return None
         
-        string_data = self.read_memory(address + 0x8, length * 2)
+        if prefetched and length <= CSHARP_STRING_PREFETCH:
+            string_data = prefetched[0x8:0x8 + length * 2]
+        else:
+            string_data = self.read_memory(address + 0x8, length * 2)
         if string_data:
             try:
                 return string_data.decode('utf-16-le').rstrip('\x00')
@@ -348,26 +403,50 @@ class OsuMemoryReader:
         try:
             if not osu_path:
                 return -1
-            with open(osu_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('Mode:') or line.startswith('Mode :'):
-                        mode_str = line.split(':', 1)[1].strip()
-                        try:
-                            return int(mode_str)
-                        except ValueError:
-                            return -1
-                    if line == '[Difficulty]':
-                        break
-            return 0
+            with open(osu_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return 0
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                    match = MODE_LINE_RE.search(view)
+                    if not match or DIFFICULTY_SECTION_RE.search(view, 0, match.start()):
+                        return 0
+                    try:
+                        return int(match.group(1).strip())
+                    except ValueError:
+                        return -1
         except Exception as e:
             if self.debug:
                 safe_print(f"[DEBUG] Error parsing beatmap mode: {e}")
             return -1
     
+    def _find_in_chunk(self, chunk: bytearray, chunk_len: int, pattern: Pattern) -> int:
+        pattern_len = len(pattern.signature)
+        if chunk_len < pattern_len:
+            return -1
+        anchor = pattern.anchor
+        if not anchor:
+            return 0
+        anchor_offset = pattern.anchor_offset
+        segments = pattern.segments
+        search_pos = anchor_offset
+        while True:
+            pos = chunk.find(anchor, search_pos, chunk_len)
+            if pos == -1:
+                return -1
+            match_start = pos - anchor_offset
+            if match_start + pattern_len > chunk_len:
+                return -1
+            if all(chunk.startswith(segment, match_start + segment_start) for segment_start, segment in segments):
+                return match_start
+            search_pos = pos + 1
+    
     def pattern_scan(self, pattern: Pattern) -> Optional[int]:
-        if not self.process_handle:
-            return None
+        return self.pattern_scan_batch({'': pattern}).get('')
+    
+    def pattern_scan_batch(self, patterns: Dict[str, Pattern]) -> Dict[str, int]:
+        found: Dict[str, int] = {}
+        if not self.process_handle or not patterns:
+            return found
 
         class MEMORY_BASIC_INFORMATION(ctypes.Structure):
             _fields_ = [
@@ -390,16 +469,14 @@ class OsuMemoryReader:
         MEM_COMMIT = 0x1000
         MEM_IMAGE = 0x1000000
 
-        pattern_len = len(pattern.signature)
-        first_byte = None
-        first_byte_mask = None
-        for i in range(pattern_len):
-            if pattern.mask[i] == 0x01:
-                first_byte = pattern.signature[i]
-                first_byte_mask = i
-                break
+        remaining = dict(patterns)
+        overlap = max(len(pattern.signature) for pattern in remaining.values())
+        chunk = bytearray(SCAN_CHUNK_SIZE + overlap)
+        chunk_buffer = (ctypes.c_char * len(chunk)).from_buffer(chunk)
+        zero_chunk = bytes(len(chunk))
+        bytes_read = ctypes.c_size_t(0)
         
-        while True:
+        while remaining:
             result = self.kernel32.VirtualQueryEx(
                 self.process_handle,
                 ctypes.c_void_p(address),
@@ -431,112 +508,117 @@ class OsuMemoryReader:
                 if region_size > 1 * 1024 * 1024:
                     continue
 
-            chunk_size = 65536
-            for offset in range(0, region_size, chunk_size):
-                read_size = min(chunk_size + pattern_len, region_size - offset)
-                chunk = self.read_memory(base_address + offset, read_size)
+            for offset in range(0, region_size, SCAN_CHUNK_SIZE):
+                read_size = min(SCAN_CHUNK_SIZE + overlap, region_size - offset)
+                success = self.kernel32.ReadProcessMemory(
+                    self.process_handle,
+                    ctypes.c_void_p(base_address + offset),
+                    chunk_buffer,
+                    read_size,
+                    ctypes.byref(bytes_read)
+                )
                 
-                if not chunk or len(chunk) < pattern_len:
+                if not success or bytes_read.value != read_size:
+                    continue
+                
+                # Untouched heap pages read back as zeros; one memcmp skips every anchor search.
+                if read_size == len(chunk) and chunk == zero_chunk:
                     continue
 
-                if first_byte is not None:
-                    search_pos = 0
-                    while True:
-                        pos = chunk.find(first_byte, search_pos)
-                        if pos == -1 or pos > len(chunk) - pattern_len:
-                            break
-                        match_start = pos - first_byte_mask
-                        if match_start < 0 or match_start + pattern_len > len(chunk):
-                            search_pos = pos + 1
-                            continue
-                        
-
-                        match = True
-                        for j in range(pattern_len):
-                            if pattern.mask[j] == 0x01:
-                                if chunk[match_start + j] != pattern.signature[j]:
-                                    match = False
-                                    break
-                        
-                        if match:
-                            return base_address + offset + match_start + pattern.offset
-                        
-                        search_pos = pos + 1
-                else:
-                    for i in range(len(chunk) - pattern_len + 1):
-                        match = True
-                        for j in range(pattern_len):
-                            if pattern.mask[j] == 0x01:
-                                if chunk[i + j] != pattern.signature[j]:
-                                    match = False
-                                    break
-                        
-                        if match:
-                            return base_address + offset + i + pattern.offset
+                for name, pattern in list(remaining.items()):
+                    match_start = self._find_in_chunk(chunk, read_size, pattern)
+                    if match_start != -1:
+                        found[name] = base_address + offset + match_start + pattern.offset
+                        del remaining[name]
+                
+                if not remaining:
+                    break
             
             if address >= 0x7FFFFFFF0000:
                 break
         
-        return None
+        return found
     
-    def scan_all_patterns(self, parallel: bool = True) -> bool:
+    def scan_all_patterns(self) -> bool:
         safe_print("Scanning for memory patterns...")
         start_time = time.time()
         success_count = 0
         
-        if parallel:
-            with ThreadPoolExecutor(max_workers=4) as executor:
-                future_to_name = {
-                    executor.submit(self.pattern_scan, pattern): name 
-                    for name, pattern in self.patterns.items()
-                }
-                
-                for future in as_completed(future_to_name):
-                    name = future_to_name[future]
-                    try:
-                        address = future.result()
-                        if address:
-                            self.base_addresses[name] = address
-                            safe_print(f"  ✓ {name:20s} -> 0x{address:X}")
-                            success_count += 1
-                        else:
-                            safe_print(f"  ✗ {name:20s} -> Not found!")
-                            if self.debug:
-                                pattern = self.patterns[name]
-                                sig_str = ' '.join([f'{b:02X}' if pattern.mask[i] else '??' 
-                                                  for i, b in enumerate(pattern.signature)])
-                                safe_print(f"    Pattern: {sig_str}")
-                    except Exception as e:
-                        safe_print(f"  ✗ {name:20s} -> Error: {e}")
-                        if self.debug:
-                            import traceback
-                            traceback.print_exc()
-        else:
-            for name, pattern in self.patterns.items():
-                safe_print(f"  Scanning for {name}...", end=' ', flush=True)
-                
-                try:
-                    address = self.pattern_scan(pattern)
-                    if address:
-                        self.base_addresses[name] = address
-                        safe_print(f"Found at 0x{address:X}")
-                        success_count += 1
-                    else:
-                        safe_print("Not found!")
-                        if self.debug:
-                            sig_str = ' '.join([f'{b:02X}' if pattern.mask[i] else '??' 
-                                              for i, b in enumerate(pattern.signature)])
-                            safe_print(f"    Pattern: {sig_str}")
-                except Exception as e:
-                    safe_print(f"Error: {e}")
-                    if self.debug:
-                        import traceback
-                        traceback.print_exc()
+        cache_key = self._signature_cache_key()
+        found = {
+            name: address
+            for name, address in self._load_signature_cache(cache_key).items()
+            if name in self.patterns and self._verify_cached_address(self.patterns[name], address)
+        }
+        cached_count = len(found)
+        
+        try:
+            missing = {name: pattern for name, pattern in self.patterns.items() if name not in found}
+            found.update(self.pattern_scan_batch(missing))
+        except Exception as e:
+            safe_print(f"  ✗ Pattern scan error: {e}")
+            if self.debug:
+                import traceback
+                traceback.print_exc()
+            found = {}
+        
+        for name, pattern in self.patterns.items():
+            address = found.get(name)
+            if address:
+                self.base_addresses[name] = address
+                safe_print(f"  ✓ {name:20s} -> 0x{address:X}")
+                success_count += 1
+            else:
+                safe_print(f"  ✗ {name:20s} -> Not found!")
+                if self.debug:
+                    sig_str = ' '.join([f'{b:02X}' if pattern.mask[i] else '??' 
+                                      for i, b in enumerate(pattern.signature)])
+                    safe_print(f"    Pattern: {sig_str}")
+        
+        if cache_key and len(found) > cached_count:
+            self._save_signature_cache(cache_key, found)
         
         elapsed = time.time() - start_time
         safe_print(f"\nFound {success_count}/{len(self.patterns)} patterns in {elapsed:.2f}s")
         return success_count >= 3
     
+    def _signature_cache_key(self) -> Optional[str]:
+        if not SIGNATURE_CACHE_PATH:
+            return None
+        try:
+            exe_path = self._get_exe_path()
+            if not exe_path:
+                return None
+            stat = os.stat(exe_path)
+            return f"{exe_path}|{stat.st_size}|{stat.st_mtime_ns}"
+        except Exception:
+            return None
+    
+    def _load_signature_cache(self, cache_key: Optional[str]) -> Dict[str, int]:
+        if not cache_key:
+            return {}
+        try:
+            with open(SIGNATURE_CACHE_PATH, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('key') == cache_key:
+                return {name: int(address) for name, address in cache.get('addresses', {}).items()}
+        except Exception:
+            pass
+        return {}
+    
+    def _save_signature_cache(self, cache_key: str, addresses: Dict[str, int]) -> None:
+        try:
+            os.makedirs(os.path.dirname(SIGNATURE_CACHE_PATH), exist_ok=True)
+            with open(SIGNATURE_CACHE_PATH, 'w', encoding='utf-8') as f:
+                json.dump({'key': cache_key, 'addresses': addresses}, f)
+        except Exception as e:
+            if self.debug:
+                safe_print(f"[DEBUG] Could not save signature cache: {e}")
+    
+    def _verify_cached_address(self, pattern: Pattern, address: int) -> bool:
+        data = self.read_memory(address - pattern.offset, len(pattern.signature))
+        return data is not None and self._find_in_chunk(data, len(data), pattern) == 0
+    
     def get_beatmap_info(self) -> Optional[BeatmapInfo]:
         if 'baseAddr' not in self.base_addresses:
             return None
@@ -553,44 +635,37 @@ class OsuMemoryReader:
         if self.debug:
             safe_print(f"[DEBUG] Selected gamemode raw value: {selected_gamemode}")
         
-        checksum_ptr = self.read_int(beatmap_addr + 0x6C)
-        checksum = self.read_csharp_string(checksum_ptr) if checksum_ptr else ""
-        
-        filename_ptr = self.read_int(beatmap_addr + 0x90)
-        filename = self.read_csharp_string(filename_ptr) if filename_ptr else ""
-        
-        folder_ptr = self.read_int(beatmap_addr + 0x78)
-        folder = self.read_csharp_string(folder_ptr) if folder_ptr else ""
-        
-        artist_ptr = self.read_int(beatmap_addr + 0x18)
-        artist = self.read_csharp_string(artist_ptr) if artist_ptr else ""
-        
-        title_ptr = self.read_int(beatmap_addr + 0x24)
-        title = self.read_csharp_string(title_ptr) if title_ptr else ""
+        data = self.read_memory(beatmap_addr, BEATMAP_STRUCT_SIZE)
+        if not data:
+            return None
         
-        difficulty_ptr = self.read_int(beatmap_addr + 0xAC)
-        difficulty = self.read_csharp_string(difficulty_ptr) if difficulty_ptr else ""
+        def read_string_at(field_offset: int) -> Optional[str]:
+            string_ptr = UINT32.unpack_from(data, field_offset)[0]
+            return self.read_csharp_string(string_ptr) if string_ptr else ""
         
-        creator_ptr = self.read_int(beatmap_addr + 0x7C)
-        creator = self.read_csharp_string(creator_ptr) if creator_ptr else ""
+        checksum = read_string_at(0x6C)
+        filename = read_string_at(0x90)
+        folder = read_string_at(0x78)
+        artist = read_string_at(0x18)
+        title = read_string_at(0x24)
+        difficulty = read_string_at(0xAC)
+        creator = read_string_at(0x7C)
         
-        map_id = self.read_int(beatmap_addr + 0xC8) or 0
-        set_id = self.read_int(beatmap_addr + 0xCC) or 0
-        ranked_status = self.read_int(beatmap_addr + 0x12C) or 0
-        object_count = self.read_int(beatmap_addr + 0xF8) or 0
+        map_id, set_id = struct.unpack_from('<II', data, 0xC8)
+        ranked_status = UINT32.unpack_from(data, 0x12C)[0]
+        object_count = UINT32.unpack_from(data, 0xF8)[0]
         
-        ar = self.read_float(beatmap_addr + 0x2C) or 0.0
-        cs = self.read_float(beatmap_addr + 0x30) or 0.0
-        hp = self.read_float(beatmap_addr + 0x34) or 0.0
-        od = self.read_float(beatmap_addr + 0x38) or 0.0
+        ar, cs, hp, od = struct.unpack_from('<4f', data, 0x2C)
 
         beatmap_mode = -1
         if folder and filename:
-            songs_folder = self.get_songs_folder()
+            beatmap_mode = self._beatmap_mode_cache.get((folder, filename), -1)
+            songs_folder = self.get_songs_folder() if beatmap_mode == -1 else None
             if songs_folder:
-                import os
                 osu_file_path = os.path.join(songs_folder, folder, filename)
                 beatmap_mode = self.parse_beatmap_mode(osu_file_path)
+                if beatmap_mode >= 0:
+                    self._beatmap_mode_cache[(folder, filename)] = beatmap_mode
                 
                 if self.debug:
                     safe_print(f"[DEBUG] Beatmap mode from file: {beatmap_mode}")
@@ -663,9 +738,8 @@ class OsuMemoryReader:
         
         try:
             try:
-                if self.process_id:
-                    process = psutil.Process(self.process_id)
-                    exe_path = process.exe()
+                exe_path = self._get_exe_path()
+                if exe_path:
                     osu_dir = os.path.dirname(exe_path)
                     songs_path = os.path.join(osu_dir, "Songs")
                     if os.path.exists(songs_path) and os.path.isdir(songs_path):
@@ -684,6 +758,15 @@ class OsuMemoryReader:
                 safe_print(f"[DEBUG] Error getting songs folder: {e}")
             return None
     
+    def _get_exe_path(self) -> Optional[str]:
+        if not self.process_id:
+            return None
+        if self._exe_path_cache and self._exe_path_cache[0] == self.process_id:
+            return self._exe_path_cache[1]
+        exe_path = psutil.Process(self.process_id).exe()
+        self._exe_path_cache = (self.process_id, exe_path)
+        return exe_path
+    
     def get_menu_mods(self) -> Optional[MenuMods]:
 
         if 'menuModsPtr' not in self.base_addresses:
@@ -705,16 +788,10 @@ class OsuMemoryReader:
         )
     
     def read_double(self, address: int) -> Optional[float]:
-        data = self.read_memory(address, 8)
-        if data:
-            return struct.unpack('<d', data)[0]
-        return None
+        return self._read_small(address, FLOAT64)
     
     def read_short(self, address: int) -> Optional[int]:
-        data = self.read_memory(address, 2)
-        if data:
-            return struct.unpack('<H', data)[0]
-        return None
+        return self._read_small(address, UINT16)
     
     def get_gameplay_data(self) -> Optional[GameplayData]:
         if 'rulesetsAddr' not in self.base_addresses:
@@ -761,15 +838,12 @@ class OsuMemoryReader:
             else:
                 accuracy = 1.0
             
-            hit_100 = self.read_short(score_base + 0x88) or 0
-            hit_300 = self.read_short(score_base + 0x8A) or 0
-            hit_50 = self.read_short(score_base + 0x8C) or 0
-            hit_geki = self.read_short(score_base + 0x8E) or 0
-            hit_katu = self.read_short(score_base + 0x90) or 0
-            hit_miss = self.read_short(score_base + 0x92) or 0
-            
-            combo = self.read_short(score_base + 0x94) or 0
-            max_combo = self.read_short(score_base + 0x68) or 0
+            counters = self.read_memory(score_base + 0x68, 0x2E)
+            if counters:
+                max_combo = UINT16.unpack_from(counters, 0)[0]
+                hit_100, hit_300, hit_50, hit_geki, hit_katu, hit_miss, combo = struct.unpack_from('<7H', counters, 0x20)
+            else:
+                max_combo = hit_100 = hit_300 = hit_50 = hit_geki = hit_katu = hit_miss = combo = 0
             
             return GameplayData(
                 player_name=player_name,
@@ -30,6 +30,14 @@ class TrayManager:
 		if not WIN32_AVAILABLE:
 			return None
 		
+		if self.hwnd and win32gui.IsWindow(self.hwnd):
+			return self.hwnd
+		
+		hwnd = win32gui.FindWindow(None, window_title)
+		if hwnd:
+			self.hwnd = hwnd
+			return hwnd
+		
 		def callback(hwnd, windows):
 			if win32gui.IsWindowVisible(hwnd):
 				title = win32gui.GetWindowText(hwnd)
@@ -49,17 +57,20 @@ class TrayManager:
 		if not PYSTRAY_AVAILABLE:
 			return False
 		
-		if not self.hwnd:
-			self.find_window_handle()
+		if not WIN32_AVAILABLE or not self.find_window_handle():
+			return False
 		
-		if self.hwnd and WIN32_AVAILABLE:
-			win32gui.ShowWindow(self.hwnd, win32con.SW_HIDE)
+		win32gui.ShowWindow(self.hwnd, win32con.SW_HIDE)
 		
 		self._create_tray_icon()
 		self.is_minimized = True
 		return True
 	
 	def restore_from_tray(self) -> bool:
+		# Wake the render loop first: a cross-thread ShowWindow blocks until the window's thread pumps messages.
+		if self.on_restore_callback:
+			self.on_restore_callback()
+		
 		if self.hwnd and WIN32_AVAILABLE:
 			win32gui.ShowWindow(self.hwnd, win32con.SW_SHOW)
 			win32gui.SetForegroundWindow(self.hwnd)
@@ -67,9 +78,6 @@ class TrayManager:
 		self._stop_tray_icon()
 		self.is_minimized = False
 		
-		if self.on_restore_callback:
-			self.on_restore_callback()
-		
 		return True
 	
 	def _create_tray_icon(self) -> None:
@@ -5,12 +5,20 @@ from pathlib import Path
 from datetime import datetime
 import psutil
 
+DB_HEADER = struct.Struct("<IIBQ")
+DB_UNLOCK = struct.Struct("<BQ")
+ULEB_PAIR = struct.Struct("<H")
+DB_UNLOCK_OFFSET = 8
+DB_HEAD_SIZE = 64
+UNIX_EPOCH_TICKS = 621355968000000000
+TICKS_PER_SECOND = 10_000_000
+
 
 def ticks_to_datetime(ticks):
 	if ticks == 0:
 		return None
-	unix_timestamp = (ticks / 10000000) - 62135596800
-	dt = datetime.fromtimestamp(unix_timestamp)
+	unix_seconds = (ticks - UNIX_EPOCH_TICKS) // TICKS_PER_SECOND
+	dt = datetime.fromtimestamp(unix_seconds)
 	return dt.strftime("%Y-%m-%d %H:%M:%S")
 
 
@@ -21,80 +29,113 @@ class OsuUnlocker:
 		self.version = None
 		self.backup_path = None
 		self.parse_offset = 0
+		self._db_path_cache = {}
+		self._osu_pid = None
+		self._status_cache = None
 		
 		self.account_locked = None
 		self.unlock_date = None
 		self.player_name = None
 	
-	def find_osu_database(self):
+	def _use_osu_process(self, process):
+		try:
+			key = (process.pid, process.create_time())
+			cached = self._db_path_cache.get(key)
+			if cached is not None:
+				self.db_path = cached
+				self._osu_pid = process.pid
+				return True
+			exe_path = process.exe()
+		except (psutil.NoSuchProcess, psutil.AccessDenied):
+			return False
+		if not exe_path:
+			return False
+		db_path = exe_path[:exe_path.rfind(os.sep) + 1] + "osu!.db"
+		try:
+			os.stat(db_path)
+		except OSError:
+			return False
+		self.db_path = Path(db_path)
+		self._db_path_cache[key] = self.db_path
+		self._osu_pid = process.pid
+		return True
+	
+	def find_osu_database(self, pid=None):
 		try:
-			for process in psutil.process_iter(["pid", "name", "exe"]):
+			pid = pid or self._osu_pid
+			if pid and psutil.pid_exists(pid):
+				try:
+					process = psutil.Process(pid)
+					if process.name().lower() == "osu!.exe" and self._use_osu_process(process):
+						return True
+				except (psutil.NoSuchProcess, psutil.AccessDenied):
+					pass
+			self._osu_pid = None
+			
+			for process in psutil.process_iter(["name"]):
 				name = process.info.get("name")
-				if name and name.lower() == "osu!.exe":
-					exe_path = process.info.get("exe")
-					if exe_path:
-						osu_dir = os.path.dirname(exe_path)
-						db_path = os.path.join(osu_dir, "osu!.db")
-						if os.path.isfile(db_path):
-							self.db_path = Path(db_path)
-							return True
+				if name and name.lower() == "osu!.exe" and self._use_osu_process(process):
+					return True
 		except Exception:
 			pass
 		
 		return False
 	
+	def _read_db_head(self, size):
+		with open(self.db_path, "rb") as f:
+			return f.read(size)
+	
 	def read_account_status(self):
 		if not self.db_path or not self.db_path.exists():
 			return False, "Database file not found"
 		
+		self.data = None
+		self._status_cache = None
 		try:
-			self.data = bytearray(self.db_path.read_bytes())
-			self.parse_offset = 0
-			
-			self.version = struct.unpack_from("<I", self.data, 0)[0]
-			self.parse_offset += 4
-			
-			folder_count = struct.unpack_from("<I", self.data, self.parse_offset)[0]
-			self.parse_offset += 4
-			
-			unlocked_byte = self.data[self.parse_offset]
-			self.account_locked = (unlocked_byte == 0x00)
-			self.parse_offset += 1
-			
-			unlock_ticks = struct.unpack_from("<Q", self.data, self.parse_offset)[0]
-			if self.account_locked and unlock_ticks > 0:
-				self.unlock_date = ticks_to_datetime(unlock_ticks)
+			data = self._read_db_head(DB_HEAD_SIZE)
+		except OSError as e:
+			return False, f"Error reading database: {str(e)}"
+		
+		data_len = len(data)
+		if data_len < DB_HEADER.size + 1:
+			return False, "Error reading database: file is truncated"
+		
+		self.version, folder_count, unlocked_byte, unlock_ticks = DB_HEADER.unpack_from(data, 0)
+		self.parse_offset = DB_HEADER.size
+		
+		self.account_locked = (unlocked_byte == 0x00)
+		if self.account_locked and unlock_ticks > 0:
+			self.unlock_date = ticks_to_datetime(unlock_ticks)
+		else:
+			self.unlock_date = None
+		
+		if data[self.parse_offset] == 0x0B:
+			u_off = self.parse_offset + 1
+			if u_off + ULEB_PAIR.size > data_len:
+				return False, "Error reading database: file is truncated"
+			v = ULEB_PAIR.unpack_from(data, u_off)[0]
+			if v & 0x80 == 0:
+				name_len = v & 0x7F
+				u_off += 1
 			else:
-				self.unlock_date = None
-			self.parse_offset += 8
-			
-			name_start = self.parse_offset
-			if self.data[self.parse_offset] == 0x0B:
-				len_uleb = 0
-				shift = 0
-				u_off = self.parse_offset + 1
-				while True:
-					byte = self.data[u_off]
-					len_uleb |= (byte & 0x7F) << shift
-					u_off += 1
-					if byte < 0x80:
-						break
-					shift += 7
-				name_len = len_uleb
-				name_bytes = self.data[u_off : u_off + name_len]
+				name_len = (v & 0x7F) | ((v >> 1) & 0x3F80)
+				u_off += 2
+			if u_off + name_len > data_len and data_len == DB_HEAD_SIZE:
 				try:
-					self.player_name = name_bytes.decode("utf-8")
-				except Exception:
-					self.player_name = "Unknown"
-				self.parse_offset = u_off + name_len
-			else:
-				self.player_name = "Empty"
-				self.parse_offset += 1
-			
-			return True, "Success"
-			
-		except Exception as e:
-			return False, f"Error reading database: {str(e)}"
+					data = self._read_db_head(u_off + name_len)
+				except OSError as e:
+					return False, f"Error reading database: {str(e)}"
+				data_len = len(data)
+			if u_off + name_len > data_len:
+				return False, "Error reading database: file is truncated"
+			self.player_name = data[u_off : u_off + name_len].decode("utf-8", "replace")
+			self.parse_offset = u_off + name_len
+		else:
+			self.player_name = "Empty"
+			self.parse_offset += 1
+		
+		self.data = data
+		return True, "Success"
 	
 	def create_backup(self):
 		if not self.db_path:
@@ -108,29 +149,23 @@ class OsuUnlocker:
 			return False
 	
 	def unlock_account(self):
-		if not self.data:
+		if self.data is None:
 			return False, "No data loaded. Read account status first."
 		
+		if not self.account_locked:
+			return True, "Account is already unlocked"
+		
 		if not self.create_backup():
 			return False, "Failed to create backup"
 		
 		try:
-			self.parse_offset = 0
-			
-			self.parse_offset += 4
-			
-			self.parse_offset += 4
-			
-			self.data[self.parse_offset] = 0x01
-			self.parse_offset += 1
-			
-			struct.pack_into("<Q", self.data, self.parse_offset, 0)
-			self.parse_offset += 8
-			
-			self.db_path.write_bytes(self.data)
+			with open(self.db_path, "r+b") as f:
+				f.seek(DB_UNLOCK_OFFSET)
+				f.write(DB_UNLOCK.pack(0x01, 0))
 			
 			self.account_locked = False
 			self.unlock_date = None
+			self._status_cache = None
 			
 			return True, "Account unlocked successfully"
 			
@@ -141,9 +176,10 @@ class OsuUnlocker:
 		if self.account_locked is None:
 			return "Not scanned yet"
 		
-		status = {
-			"locked": self.account_locked,
-			"unlock_date": self.unlock_date if self.unlock_date else "None",
-			"player_name": self.player_name if self.player_name else "Unknown"
-		}
-		return status
+		if self._status_cache is None:
+			self._status_cache = {
+				"locked": self.account_locked,
+				"unlock_date": self.unlock_date if self.unlock_date else "None",
+				"player_name": self.player_name if self.player_name else "Unknown"
+			}
+		return self._status_cache
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+for _module in ("dearpygui", "keyboard", "psutil"):
+	pytest.importorskip(_module)
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "PrismaTC"))
+
+from main import parse_osu_file
+
+
+def _rows(hit_objects):
+	return [(o.x, o.y, o.timestamp, o.object_type, o.end_time) for o in hit_objects]
+
+
+def test_parse_osu_file_accepts_whitespace_around_fields(tmp_path):
+	osu_path = tmp_path / "spaced.osu"
+	osu_path.write_bytes(
+		b"osu file format v14\r\n\r\n[HitObjects]\r\n"
+		b"64,192,1000,1,0,0:0:0:0:\r\n"
+		b" 192 , 192 , 1500 , 1 , 0 , 0:0:0:0:\r\n"
+		b"448,\t192,\t2000,\t128,\t0, 2600 :0:0:0:0:\r\n"
+		b"\r\n"
+	)
+
+	hit_objects, first_hit_time = parse_osu_file(str(osu_path))
+
+	assert first_hit_time == 1000
+	assert _rows(hit_objects) == [
+		(64, 192, 1000, 1, 1000),
+		(192, 192, 1500, 1, 1500),
+		(448, 192, 2000, 128, 2600),
+	]